@@ -12,7 +12,6 @@ setup(
         "dsnparse",
         "emailed-before",
         "faker",
-        "pandas",
         "prettytable",
         "pymysql",
         "psycopg2",
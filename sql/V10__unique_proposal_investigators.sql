@@ -0,0 +1,18 @@
+SET search_path TO admin, observations;
+
+-- remove duplicate proposal investigators
+
+DELETE FROM proposal_investigator a
+    USING proposal_investigator b
+WHERE a.ctid < b.ctid
+  AND a.proposal_id = b.proposal_id
+  AND a.institution_user_id = b.institution_user_id;
+
+-- an investigator must not be added more than once to the same proposal
+
+ALTER TABLE proposal_investigator
+    ADD CONSTRAINT proposal_investigator_unique UNIQUE (proposal_id, institution_user_id);
+
+-- the unique constraint's index covers queries by proposal
+
+DROP INDEX proposal_investigator_proposal_idx;
@@ -0,0 +1,10 @@
+SET search_path TO observations;
+
+-- Artifacts are looked up by their raw path, both for an exact path and for all the
+-- paths in a directory (i.e. with a LIKE prefix pattern).
+
+CREATE INDEX artifact_raw_path_idx ON artifact (((paths).raw) text_pattern_ops);
+
+-- Observation groups are looked up by their identifier.
+
+CREATE INDEX observation_group_group_identifier_idx ON observation_group (group_identifier);
@@ -5,6 +5,7 @@ from ssda.ssda_delete import delete_in_ssda
 from ssda.ssda_populate import populate_ssda
 from ssda.ssda_sync import sync_ssda
 from ssda.ssda_daily_update import daily_update
+from ssda.util.fits import DEFAULT_PREFETCH_WORKERS
 
 
 @click.group()
@@ -31,6 +32,12 @@ def main():
     multiple=True,
     help="Instrument to consider.",
 )
+@click.option(
+    "--prefetch-workers",
+    type=click.IntRange(min=1),
+    help=f"Number of threads for reading FITS files in advance (default: "
+    f"{DEFAULT_PREFETCH_WORKERS}).",
+)
 @click.option(
     "--skip-errors", is_flag=True, help="Do not terminate if there is an error"
 )
@@ -43,10 +50,20 @@ def populate(start: Optional[str],
              instruments: Tuple[str],
              file: Optional[str],
              fits_base_dir: Optional[str],
+             prefetch_workers: Optional[int],
              skip_errors: bool,
              verbosity: Optional[str]):
     """Populate the database SSDA"""
-    populate_ssda(start, end, instruments, file, fits_base_dir, skip_errors, verbosity)
+    populate_ssda(
+        start,
+        end,
+        instruments,
+        file,
+        fits_base_dir,
+        skip_errors,
+        verbosity,
+        prefetch_workers=prefetch_workers,
+    )
 
 
 @main.command()
@@ -1,92 +1,131 @@
 import os
-from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
+import numpy as np
 from astropy.units import Quantity
 from ssda.util import types
 from astropy import units as u
 
 dirname = os.path.dirname(__file__)
 
+# Names of the data files for Salticam and BCAM filter names.
+_SALT_IMAGING_CAMERA_FILTER_NAMES: Dict[str, str] = {
+    "Halpha-S1": "H-alpha",
+    "H-alpha": "H-alpha",
+    "SDSSr-S1": "SDSS_rp",
+    "SDSSi-S1": "SDSS_ip",
+    "SDSSg-S1": "SDSS_gp",
+    "SDSSu-S1": "SDSS_up",
+    "SDSSz-S1": "SDSS_zp",
+    "CLR-S1": "Fused_silica_clear",
+    "B-S1": "Johnson_B",
+    "U-S1": "Johnson_U",
+    "I-S1": "Cousins_I",
+    "R-S1": "Cousins_R",
+    "380-40": "380nm_40nm_FWHM",
+    "Su-S1": "Stroemgren_u",
+    "V-S1": "Johnson_V",
+    "Sv-S1": "Stroemgren_v",
+    "Sb-S1": "Stroemgren_b",
+    "Sy-S1": "Stroemgren_y",
+}
+
+# Names of the data files for SDSS filter names, such as SDSS-r or SDSS-r', with the
+# quotes removed.
+_SDSS_FILTER_NAMES: Dict[str, str] = {
+    "SDSS-r": "SDSS_rp",
+    "SDSS-i": "SDSS_ip",
+    "SDSS-g": "SDSS_gp",
+    "SDSS-u": "SDSS_up",
+    "SDSS-z": "SDSS_zp",
+}
+
+# Wavelengths and transmissions already read, keyed by filter name and instrument.
+_filter_curves: Dict[Tuple[str, types.Instrument], Tuple[Quantity, np.ndarray]] = {}
+
+# Wavelengths and FWHMs for all Fabry-Perot modes, sorted by wavelength and keyed by
+# the mode.
+_fp_fwhm: Dict[types.RSSFabryPerotMode, Tuple[Quantity, Quantity]] = {}
+
 
 def _parse_filter_name(_filter: str, instrument: types.Instrument) -> str:
     if instrument.value == "Salticam" or instrument.value == "BCAM":
-        if _filter == "Halpha-S1" or _filter == "H-alpha":
-            return "H-alpha"
-        if _filter == "SDSSr-S1" or _filter.replace("'", "") == "SDSS-r":
-            return "SDSS_rp"
-        if _filter == "SDSSi-S1" or _filter.replace("'", "") == "SDSS-i":
-            return "SDSS_ip"
-        if _filter == "SDSSg-S1" or _filter.replace("'", "") == "SDSS-g":
-            return "SDSS_gp"
-        if _filter == "SDSSu-S1" or _filter.replace("'", "") == "SDSS-u":
-            return "SDSS_up"
-        if _filter == "SDSSz-S1" or _filter.replace("'", "") == "SDSS-z":
-            return "SDSS_zp"
-        if _filter == "CLR-S1":
-            return "Fused_silica_clear"
-        if _filter == "B-S1":
-            return "Johnson_B"
-        if _filter == "U-S1":
-            return "Johnson_U"
-        if _filter == "I-S1":
-            return "Cousins_I"
-        if _filter == "R-S1":
-            return "Cousins_R"
-        if _filter == "380-40":
-            return "380nm_40nm_FWHM"
-        if _filter == "Su-S1":
-            return "Stroemgren_u"
-        if _filter == "V-S1":
-            return "Johnson_V"
-        if _filter == "Sv-S1":
-            return "Stroemgren_v"
-        if _filter == "Sb-S1":
-            return "Stroemgren_b"
-        if _filter == "Sy-S1":
-            return "Stroemgren_y"
+        if _filter in _SALT_IMAGING_CAMERA_FILTER_NAMES:
+            return _SALT_IMAGING_CAMERA_FILTER_NAMES[_filter]
+        sdss_filter = _filter.replace("'", "")
+        if sdss_filter in _SDSS_FILTER_NAMES:
+            return _SDSS_FILTER_NAMES[sdss_filter]
     return _filter
 
 
 def wavelengths_and_transmissions(
     filter_name: str, instrument: types.Instrument
 ) -> List[Tuple[Quantity, float]]:
-    wavelengths = []
-    filt_name = _parse_filter_name(filter_name, instrument)
+    wavelengths, transmissions = filter_curve(filter_name, instrument)
+    return list(zip(wavelengths, transmissions.tolist()))
+
+
+def filter_curve(
+    filter_name: str, instrument: types.Instrument
+) -> Tuple[Quantity, np.ndarray]:
+    """
+    The wavelengths and transmissions of a filter.
+
+    The wavelengths are not guaranteed to be sorted. The returned arrays must not be
+    modified, as they are cached.
+
+    Parameters
+    ----------
+    filter_name : str
+        Filter name.
+    instrument : Instrument
+        Instrument.
+
+    Returns
+    -------
+    Tuple[Quantity, np.ndarray]
+        The array of wavelengths and the array of corresponding transmissions.
+
+    """
+
     if not instrument or not filter_name:
         raise ValueError(
             "Filter name and instrument must be provided to use this method"
         )
+
+    # The data files don't change, so each of them needs to be found and read only
+    # once.
+    key = (filter_name, instrument)
+    if key in _filter_curves:
+        return _filter_curves[key]
+
+    filt_name = _parse_filter_name(filter_name, instrument)
     instrument_path_name = instrument.value.lower()
     if instrument_path_name == "bcam":
         instrument_path_name = "salticam"  # No filters for bcam it uses salticam'
     if instrument_path_name == "rss":
-        filepath = Path(f"{dirname}/{instrument_path_name}/{filt_name}.txt")
+        filepath = os.path.join(dirname, instrument_path_name, f"{filt_name}.txt")
         # Rss may use a Salticam filter.
         # If a Salticam filter is used, read the filter from the Salticam filters.
-        if not filepath.exists():
+        if not os.path.exists(filepath):
             instrument_path_name = "salticam"
 
-    filename = f"{dirname}/{instrument_path_name}/{filt_name}.txt"
-    with open(filename, "r") as file:
-        for line in file.readlines():
-
-            if (
-                len(line.split()) == 2
-                and not line.startswith("!")
-                and not line.startswith("#")
-            ):
-                wavelengths.append(
-                    (float(line.split()[0]) * u.angstrom, float(line.split()[1]))
-                )
-    return wavelengths
+    filename = os.path.join(dirname, instrument_path_name, f"{filt_name}.txt")
+
+    # Each data line contains a wavelength (in Angstrom) and a transmission. The
+    # whole file is parsed in one go, and the units are attached to all wavelengths at
+    # once.
+    data = np.loadtxt(filename, comments=("!", "#"), ndmin=2, encoding="ascii")
+
+    _filter_curves[key] = (data[:, 0] * u.angstrom, data[:, 1])
+    return _filter_curves[key]
 
 
 def fp_fwhm(rss_fp_mode: types.RSSFabryPerotMode) -> List[Tuple[Quantity, Quantity]]:
     """
     The list of wavelength-transmission pairs for an HRS mode.
 
-    The list items are not guaranteed to be sorted.
+    The list items are sorted by wavelength.
 
     Parameters
     ----------
@@ -96,29 +135,69 @@ def fp_fwhm(rss_fp_mode: types.RSSFabryPerotMode) -> List[Tuple[Quantity, Quanti
     ----------
 
     """
+    wavelengths, fwhms = fp_fwhm_curve(rss_fp_mode)
+    return list(zip(wavelengths, fwhms))
+
+
+def fp_fwhm_curve(rss_fp_mode: types.RSSFabryPerotMode) -> Tuple[Quantity, Quantity]:
+    """
+    The wavelengths and FWHMs for an RSS Fabry-Perot mode.
+
+    The arrays are sorted by wavelength, and they are empty if there is no data for
+    the mode. They must not be modified, as they are cached.
+
+    Parameters
+    ----------
+    rss_fp_mode : RSSFabryPerotMode
+        Fabry-Perot mode.
+
+    Returns
+    -------
+    Tuple[Quantity, Quantity]
+        The array of wavelengths and the array of corresponding FWHMs.
+
+    """
+
     if not rss_fp_mode:
         raise ValueError("A resolution must be provided to use this method")
 
-    fp_modes = []
+    # The file contains the data for all modes, and it is read only once.
+    if not _fp_fwhm:
+        _fp_fwhm.update(_read_fp_fwhm())
+
+    if rss_fp_mode not in _fp_fwhm:
+        return np.array([]) * u.nm, np.array([]) * u.nm
+    return _fp_fwhm[rss_fp_mode]
+
+
+def _read_fp_fwhm() -> Dict[types.RSSFabryPerotMode, Tuple[Quantity, Quantity]]:
+    """
+    Read the wavelengths and FWHMs for all the RSS Fabry-Perot modes.
+
+    Returns
+    -------
+    Dict[RSSFabryPerotMode, Tuple[Quantity, Quantity]]
+        The wavelengths and FWHMs, sorted by wavelength and keyed by Fabry-Perot mode.
+
+    """
+
+    fp_modes: Dict[types.RSSFabryPerotMode, List[Tuple[float, float]]] = {}
     filename = os.path.join(dirname, "rss/properties_of_fp_modes.txt")
     with open(filename, "r") as file:
-        for line in file.readlines():
-            if line and not line.startswith("!") and not line.startswith("#"):
-                if len(line.split()) > 7 and line.split()[0] in [
-                    "TF",
-                    "LR",
-                    "MR",
-                    "HR",
-                ]:
-                    if (
-                        types.RSSFabryPerotMode.parse_fp_mode(line.split()[0])
-                        == rss_fp_mode
-                    ):  # Resolution
-                        fp_modes.append(
-                            (
-                                float(line.split()[2]) * u.nm,  # wavelength,
-                                float(line.split()[3]) * u.nm,  # fwhm,
-                            )
-                        )
-
-    return fp_modes
+        for line in file:
+            if line.startswith("!") or line.startswith("#"):
+                continue
+            columns = line.split()
+            if len(columns) > 7 and columns[0] in ["TF", "LR", "MR", "HR"]:
+                fp_mode = types.RSSFabryPerotMode.parse_fp_mode(columns[0])
+                fp_modes.setdefault(fp_mode, []).append(
+                    (float(columns[2]), float(columns[3]))  # wavelength, fwhm
+                )
+
+    fp_fwhm_curves: Dict[types.RSSFabryPerotMode, Tuple[Quantity, Quantity]] = {}
+    for fp_mode, pairs in fp_modes.items():
+        data = np.array(pairs)
+        data = data[np.argsort(data[:, 0], kind="stable")]
+        fp_fwhm_curves[fp_mode] = (data[:, 0] * u.nm, data[:, 1] * u.nm)
+
+    return fp_fwhm_curves
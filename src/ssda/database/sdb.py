@@ -10,8 +10,8 @@ from enum import Enum
 from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from dateutil import relativedelta
-import pandas as pd
 from pymysql import connect
+from pymysql.cursors import DictCursor
 
 from ssda.util import types
 from ssda.util.fits import (
@@ -68,6 +68,8 @@ class SaltDatabaseService:
         )
         self._cursor = self._connection.cursor()
         self._proposal_codes_existing: Dict[str, bool] = {}
+        self._proposal_types: Dict[str, str] = {}
+        self._target_types: Dict[int, str] = {}
 
     def find_block_visit_ids(
         self, night: date, include_fits_headers: bool = True
@@ -152,15 +154,20 @@ class SaltDatabaseService:
         if proposal_code in self._proposal_codes_existing:
             return self._proposal_codes_existing[proposal_code]
 
+        # There is a proposal entry per semester, so there is no need to count them all
         sql = """
-    SELECT COUNT(*) AS ProposalCount
-    FROM Proposal
-    JOIN ProposalCode ON Proposal.ProposalCode_Id=ProposalCode.ProposalCode_Id
-    WHERE Proposal_Code=%s
+    SELECT EXISTS (
+        SELECT 1
+        FROM Proposal
+        JOIN ProposalCode ON Proposal.ProposalCode_Id=ProposalCode.ProposalCode_Id
+        WHERE Proposal_Code=%s
+    ) AS ProposalExists
             """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            result = cursor.fetchone()
 
-        existing = results.ProposalCount[0] > 0
+        existing = bool(result["ProposalExists"])
         self._proposal_codes_existing[proposal_code] = existing
 
         return existing
@@ -190,8 +197,12 @@ class SaltDatabaseService:
 
         # Extract data from the FileData table and - if requested - the FITS headers.
         file_data_from_db = self._find_file_data_from_database(night)
+        # The database data takes precedence, so there is no need to open the FITS
+        # files recorded in the database.
         file_data_from_fits = (
-            self._find_file_data_from_fits_headers(night)
+            self._find_file_data_from_fits_headers(
+                night, {fd.file_name for fd in file_data_from_db}
+            )
             if include_fits_headers
             else []
         )
@@ -260,32 +271,38 @@ class SaltDatabaseService:
     WHERE UTStart BETWEEN %s AND %s
     ORDER BY UTStart
             """
-        file_data_results = pd.read_sql(
-            file_data_sql, self._connection, params=(start_time, end_time)
-        )
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(file_data_sql, (start_time, end_time))
+            file_data_results = cursor.fetchall()
 
         return [
             FileDataItem(
-                ut_start=row.UTStart.to_pydatetime().replace(tzinfo=timezone.utc),
-                file_name=row.FileName,
-                proposal_code=row.Proposal_Code,
-                target_name=row.Target_Name.strip(),
-                block_visit_id=int(row.BlockVisit_Id)
-                if not pd.isna(row.BlockVisit_Id)
+                ut_start=row["UTStart"].replace(tzinfo=timezone.utc),
+                file_name=row["FileName"],
+                proposal_code=row["Proposal_Code"],
+                target_name=row["Target_Name"].strip(),
+                block_visit_id=int(row["BlockVisit_Id"])
+                if row["BlockVisit_Id"] is not None
                 else None,
                 block_visit_id_status=None,
             )
-            for row in file_data_results.itertuples()
+            for row in file_data_results
         ]
 
-    def _find_file_data_from_fits_headers(self, night: date) -> List[FileDataItem]:
+    def _find_file_data_from_fits_headers(
+        self, night: date, ignored_file_names: Set[str]
+    ) -> List[FileDataItem]:
         """
         Collect the file data from the FITS file headers.
 
+        FITS files whose name is in the given set of ignored file names are not opened.
+
         Parameters
         ----------
         night : date
             Observing night.
+        ignored_file_names : Set[str]
+            Names of the FITS files to ignore.
 
         Returns
         -------
@@ -328,6 +345,7 @@ class SaltDatabaseService:
         return [
             _parse_header(StandardFitsFile(f))
             for f in fits_file_paths(nights, instruments, base_dir)
+            if os.path.basename(f) not in ignored_file_names
         ]
 
     def _merge_file_data(
@@ -403,19 +421,17 @@ class SaltDatabaseService:
     WHERE FileData.UTStart BETWEEN %s AND %s AND NightInfo.Date=%s
     ORDER BY ProposalCode.Proposal_Code, Target.Target_Name, BlockVisit.BlockVisit_Id
             """
-        block_visits_results = pd.read_sql(
-            block_visits_sql,
-            self._connection,
-            params=(start_time, end_time, night_date),
-        )
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(block_visits_sql, (start_time, end_time, night_date))
+            block_visits_results = cursor.fetchall()
 
         # We'd miss some block visits if we don't change their status from "Deleted" or
         # "In queue".
         def correct_block_visit_status(_row):
-            if _row.BlockVisit_Id in (8595, 9582, 9584, 11308, 11314, 12252, 14317):
+            if _row["BlockVisit_Id"] in (8595, 9582, 9584, 11308, 11314, 12252, 14317):
                 return "Rejected"
             else:
-                return _row.BlockVisitStatus
+                return _row["BlockVisitStatus"]
 
         # Each combination of proposal code and target name is linked to a list of
         # corresponding block visit ids. We also link them to an index variable, so
@@ -429,13 +445,14 @@ class SaltDatabaseService:
         # value has been observed earlier. This is not a good assumption, but it is
         # correct and we don't have much of a choice.
         block_visit_ids: Dict[BlockKey, List[int]] = defaultdict(list)
-        for row in block_visits_results.itertuples():
+        for row in block_visits_results:
             block_visit_status = correct_block_visit_status(row)
             if block_visit_status in status_values:
                 key = BlockKey(
-                    proposal_code=row.Proposal_Code, target_name=row.Target_Name.strip()
+                    proposal_code=row["Proposal_Code"],
+                    target_name=row["Target_Name"].strip(),
                 )
-                block_visit_ids[key].append(int(row.BlockVisit_Id))
+                block_visit_ids[key].append(int(row["BlockVisit_Id"]))
 
         return block_visit_ids
 
@@ -838,14 +855,15 @@ FROM ProposalCode
     JOIN Investigator ON ProposalContact.Leader_Id=Investigator.Investigator_Id
 WHERE ProposalCode.Proposal_Code=%s;
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,))
-        if not len(results):
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            result = cursor.fetchone()
+        if not result:
             raise ValueError(
                 f'No Principal Investigator found for proposal code "{proposal_code}". Does the proposal code exist?'
             )
-        results = results.iloc[0]
-        if results["FullName"]:
-            return results["FullName"]
+        if result["FullName"]:
+            return result["FullName"]
         raise ValueError("Observation have no Principal Investigator")
 
     def find_proposal_title(self, proposal_code: str) -> str:
@@ -858,9 +876,11 @@ WHERE ProposalCode.Proposal_Code=%s
 ORDER BY Semester.Year DESC, Semester.Semester DESC
 LIMIT 1
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,)).iloc[0]
-        if results["Title"]:
-            return f"{results['Title']}"
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            result = cursor.fetchone()
+        if result and result["Title"]:
+            return f"{result['Title']}"
         raise ValueError("Observation has no title")
 
     def find_observation_status(
@@ -882,17 +902,15 @@ FROM BlockVisit
      JOIN BlockVisitStatus USING(BlockVisitStatus_Id)
 WHERE BlockVisit_Id=%s
         """
-        status_results = pd.read_sql(
-            status_sql, self._connection, params=(block_visit_id,)
-        )
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(status_sql, (block_visit_id,))
+            status_results = cursor.fetchone()
 
-        if not len(status_results):
+        if not status_results:
             raise Exception(
                 f"No block visit status found for block visit id " f"{block_visit_id}."
             )
 
-        status_results = status_results.iloc[0]
-
         if status_results["BlockVisitStatus"].lower() == "accepted":
             return types.Status.ACCEPTED
         if status_results["BlockVisitStatus"].lower() == "rejected":
@@ -906,15 +924,15 @@ JOIN BlockVisitStatus AS bvs ON bv.BlockVisitStatus_Id = bvs.BlockVisitStatus_Id
 WHERE bv.Block_Id=(SELECT bv2.Block_Id FROM BlockVisit AS bv2 WHERE bv2.BlockVisit_Id=%(id)s)
       AND bv.NightInfo_Id=(SELECT bv3.NightInfo_Id FROM BlockVisit AS bv3 WHERE bv3.BlockVisit_Id=%(id)s);
         """
-        visits_results = pd.read_sql(
-            visits_sql, self._connection, params={"id": block_visit_id}
-        )
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(visits_sql, {"id": block_visit_id})
+            visits_results = cursor.fetchall()
         all_visits = len(visits_results)
         accepted_visits = len(
-            visits_results[visits_results["BlockVisitStatus"] == "Accepted"]
+            [v for v in visits_results if v["BlockVisitStatus"] == "Accepted"]
         )
         rejected_visits = len(
-            visits_results[visits_results["BlockVisitStatus"] == "Rejected"]
+            [v for v in visits_results if v["BlockVisitStatus"] == "Rejected"]
         )
         other_visits = all_visits - accepted_visits - rejected_visits
 
@@ -957,7 +975,9 @@ JOIN NightInfo ON BlockVisit.NightInfo_Id=NightInfo.NightInfo_Id
 JOIN Semester ON Date BETWEEN Semester.StartSemester AND Semester.EndSemester
 WHERE Proposal_Code=%s;
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,)).iloc[0]
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            results = cursor.fetchone()
 
         end_semester = results["EndSemester"]
         proposal_type = results["ProposalType"]
@@ -981,9 +1001,9 @@ WHERE Proposal_Code=%s;
             FROM Semester
             WHERE DATE(NOW()) BETWEEN Semester.StartSemester AND Semester.EndSemester
             """
-            end_semester_results = pd.read_sql(end_semester_sql, self._connection).iloc[
-                0
-            ]
+            with self._connection.cursor(DictCursor) as cursor:
+                cursor.execute(end_semester_sql)
+                end_semester_results = cursor.fetchone()
             end_semester = end_semester_results["EndSemester"]
 
         if proprietary_period is None:
@@ -1016,10 +1036,12 @@ FROM ProposalInvestigator
     JOIN PiptUser ON Investigator.PiptUser_Id=PiptUser.PiptUser_Id
 WHERE ProposalCode.Proposal_Code=%s;
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            results = cursor.fetchall()
         if len(results):
             ps = []
-            for index, row in results.iterrows():
+            for row in results:
                 ps.append(row["PiptUser_Id"])
             return ps
         raise ValueError("Observation has no Investigators")
@@ -1035,6 +1057,9 @@ WHERE ProposalCode.Proposal_Code=%s;
         except ValueError:
             return "00.00.00.00"
 
+        if block_visit_id in self._target_types:
+            return self._target_types[block_visit_id]
+
         sql = """
 SELECT TargetSubType.NumericCode as NumericCode FROM BlockVisit
     JOIN `Block` ON BlockVisit.Block_Id=`Block`.Block_Id
@@ -1046,15 +1071,16 @@ SELECT TargetSubType.NumericCode as NumericCode FROM BlockVisit
 WHERE BlockVisit.BlockVisit_Id=%s
         """
 
-        results = pd.read_sql(sql, self._connection, params=(block_visit_id,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (block_visit_id,))
+            results = cursor.fetchone()
 
-        if not len(results):
+        if not results:
             return "00.00.00.00"
 
-        results = results.iloc[0]
-
         if results["NumericCode"]:
-            return results["NumericCode"]
+            self._target_types[block_visit_id] = results["NumericCode"]
+            return self._target_types[block_visit_id]
         raise ValueError(
             f"No numeric code defined for the target type of block visit "
             f"{block_visit_id}"
@@ -1065,11 +1091,13 @@ WHERE BlockVisit.BlockVisit_Id=%s
         sql = """
 SELECT RssMaskType FROM RssMask JOIN RssMaskType USING(RssMaskType_Id)  WHERE Barcode=%s
         """
-        results = pd.read_sql(sql, self._connection, params=(slit_barcode,))
-        if len(results) <= 0:
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (slit_barcode,))
+            result = cursor.fetchone()
+        if not result:
             return False
 
-        return results.iloc[0]["RssMaskType"] == "MOS"
+        return result["RssMaskType"] == "MOS"
 
     def institution_memberships(
         self, user_id: int
@@ -1109,9 +1137,11 @@ SELECT RssMaskType FROM RssMask JOIN RssMaskType USING(RssMaskType_Id)  WHERE Ba
                     WHERE PiptUser.PiptUser_Id=%s AND Partner.Partner_Code != "OTH" AND Partner.Virtual = 0
                 """
 
-        df = pd.read_sql(sql, self._connection, params=(user_id,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (user_id,))
+            results = cursor.fetchall()
         membership_intervals: Set[types.InstitutionMembership] = set()
-        for partner_code in df["Partner_Code"]:
+        for partner_code in (row["Partner_Code"] for row in results):
             for partner_membership_interval in partner_membership_intervals[
                 partner_code
             ]:
@@ -1173,10 +1203,12 @@ FROM BlockVisit
     JOIN ProposalCode USING(ProposalCode_Id)
 WHERE Proposal_Code = %s
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            results = cursor.fetchall()
         ps = dict()
         if len(results):
-            for index, row in results.iterrows():
+            for row in results:
                 block_visit_id = str(row["BlockVisit_Id"])
                 if row["BlockVisitStatus"] in ["Accepted", "Rejected"]:
                     ps[block_visit_id] = types.SALTObservationGroup(
@@ -1219,9 +1251,11 @@ FROM Proposal
     JOIN ProposalGeneralInfo USING(ProposalCode_Id)
 WHERE Current = 1 AND Phase = 2 AND SubmissionDate >= %(from_date)s
             """
-        results = pd.read_sql(sql, self._connection, params=dict(from_date=from_date))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, dict(from_date=from_date))
+            results = cursor.fetchall()
         proposals = dict()
-        for _, row in results.iterrows():
+        for row in results:
             proposal_code = row["Proposal_Code"]
             release_date = self.find_release_date(proposal_code=proposal_code)
             investigators = self.find_proposal_investigator_user_ids(
@@ -1250,16 +1284,21 @@ FROM ProposalInvestigator
     JOIN PiptUser ON Investigator.PiptUser_Id=PiptUser.PiptUser_Id
 WHERE ProposalCode.Proposal_Code=%s;
         """
-        results = pd.read_sql(sql, self._connection, params=(proposal_code,))
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, (proposal_code,))
+            results = cursor.fetchall()
         if len(results):
             ps = []
-            for index, row in results.iterrows():
+            for row in results:
                 ps.append(str(row["PiptUser_Id"]))
             return ps
         raise ValueError("Observation has no Investigators")
 
     def sdb_proposal_type(self, proposal_code: str) -> str:
-        with self._connection.cursor():
+        if proposal_code in self._proposal_types:
+            return self._proposal_types[proposal_code]
+
+        with self._connection.cursor(DictCursor) as cursor:
             sql = """
             SELECT ProposalType
             FROM ProposalType
@@ -1267,15 +1306,16 @@ WHERE ProposalCode.Proposal_Code=%s;
             JOIN ProposalCode ON ProposalGeneralInfo.ProposalCode_Id = ProposalCode.ProposalCode_Id
             WHERE ProposalCode.Proposal_Code=%s
             """
-            results = pd.read_sql(sql, self._connection, params=(proposal_code,))
+            cursor.execute(sql, (proposal_code,))
+            results = cursor.fetchone()
 
-            if not len(results):
+            if not results:
                 raise ValueError(
                     f"No proposal type could be found for the proposal code {proposal_code}."
                 )
 
-            results = results.iloc[0]
-            return str(results["ProposalType"])
+            self._proposal_types[proposal_code] = str(results["ProposalType"])
+            return self._proposal_types[proposal_code]
 
     def is_block_visit_in_night(self, block_visit_id: int, night: date) -> bool:
         """
@@ -1296,15 +1336,15 @@ WHERE ProposalCode.Proposal_Code=%s;
         """
 
         sql = """
-        SELECT COUNT(*) AS BlockVisitCount
-        FROM BlockVisit
-        JOIN NightInfo ON BlockVisit.NightInfo_Id = NightInfo.NightInfo_Id
-        WHERE BlockVisit.BlockVisit_Id=%(block_visit_id)s AND NightInfo.Date=%(night)s
+        SELECT EXISTS (
+            SELECT 1
+            FROM BlockVisit
+            JOIN NightInfo ON BlockVisit.NightInfo_Id = NightInfo.NightInfo_Id
+            WHERE BlockVisit.BlockVisit_Id=%(block_visit_id)s AND NightInfo.Date=%(night)s
+        ) AS BlockVisitExists
         """
-        results = pd.read_sql(
-            sql,
-            self._connection,
-            params={"block_visit_id": block_visit_id, "night": night},
-        ).iloc[0]
+        with self._connection.cursor(DictCursor) as cursor:
+            cursor.execute(sql, {"block_visit_id": block_visit_id, "night": night})
+            results = cursor.fetchone()
 
-        return results["BlockVisitCount"] > 0
+        return bool(results["BlockVisitExists"])
@@ -1,13 +1,16 @@
 import logging
+import re
 from datetime import date, datetime, timedelta
-from typing import cast, Any, Dict, Optional, List
+from typing import cast, Any, Dict, Iterator, Optional, List, Set, Tuple
 import os
 
 import astropy.units as u
 from psycopg2 import connect
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+from psycopg2.extras import execute_values
 
 from ssda.util import types
-from ssda.util.fits import get_fits_base_dir
+from ssda.util.fits import fits_file_path_relative_to_base_dir
 from ssda.util.setup_logger import setup_logger
 
 info_log = setup_logger(
@@ -16,6 +19,20 @@ info_log = setup_logger(
     logging.Formatter("%(asctime)s %(levelname)s - %(message)s"),
 )
 
+# Pattern for query parameters of the form %(name)s.
+_QUERY_PARAMETER = re.compile(r"%\((\w+)\)s")
+
+# Lookup tables, with their value and id column.
+_LOOKUP_TABLES = {
+    "institution": ("name", "institution_id"),
+    "instrument": ("name", "instrument_id"),
+    "instrument_keyword": ("keyword", "instrument_keyword_id"),
+    "intent": ("intent", "intent_id"),
+    "status": ("status", "status_id"),
+    "target_type": ("numeric_code", "target_type_id"),
+    "telescope": ("name", "telescope_id"),
+}
+
 
 class SSDADatabaseService:
     """
@@ -31,27 +48,73 @@ class SSDADatabaseService:
             port=database_config.port(),
             database=database_config.database(),
         )
+        self._existing_raw_paths: Dict[str, Set[str]] = {}
+        self._institution_user_ids: Dict[Tuple[str, types.Institution], int] = {}
+        self._instrument_specific_statement_names: Dict[str, str] = {}
+        self._observation_group_ids: Dict[Tuple[str, types.Telescope], int] = {}
+        self._new_observation_group_identifiers: Dict[int, Optional[str]] = {}
+        self._prepared_statements: Dict[str, Tuple[str, List[str]]] = {}
+        self._proposal_ids: Dict[Tuple[str, types.Institution], int] = {}
+        self._lookup_ids: Dict[str, Dict[str, int]] = {}
+        self._missing_lookup_values: Dict[str, Set[str]] = {}
+        self._transaction_depth = 0
 
     def begin_transaction(self) -> None:
         """
         Start a transaction.
 
+        Transactions may be nested. A nested transaction is realised as a savepoint
+        within the outermost transaction, so that it can be rolled back without
+        affecting the changes made in the enclosing transaction.
+
         """
 
-        # PostgreSQL automatically starts a transaction, so there is nothing to do
-        pass
+        # PostgreSQL automatically starts a transaction, so there is nothing to do for
+        # the outermost transaction
+        if self._transaction_depth > 0:
+            with self._connection.cursor() as cur:
+                cur.execute(f"SAVEPOINT {self._savepoint()}")
+        self._transaction_depth += 1
 
     def commit_transaction(self) -> None:
         """
         Commit the current transaction.
 
+        If the transaction is a nested one, its changes only become persistent when
+        the outermost transaction is committed.
+
         """
 
-        self._connection.commit()
+        if self._transaction_depth > 0:
+            self._transaction_depth -= 1
+        if self._transaction_depth > 0:
+            with self._connection.cursor() as cur:
+                cur.execute(f"RELEASE SAVEPOINT {self._savepoint()}")
+        else:
+            self._connection.commit()
+
+            # Lookup values might have been added by others in the meantime.
+            self._missing_lookup_values.clear()
 
     def connection(self) -> connect:
         return self._connection
 
+    def is_transaction_failed(self) -> bool:
+        """
+        Check whether the current transaction has failed.
+
+        PostgreSQL ignores all statements in a failed transaction, and committing it
+        rolls it back. A failed transaction thus has to be rolled back explicitly.
+
+        Returns
+        -------
+        bool
+            Whether the current transaction has failed.
+
+        """
+
+        return self._connection.get_transaction_status() == TRANSACTION_STATUS_INERROR
+
     def delete_observation(self, observation_id: int) -> None:
         """
         Delete an observation.
@@ -70,6 +133,9 @@ class SSDADatabaseService:
 
             cur.execute(sql, dict(observation_id=observation_id))
 
+        # The deleted artifact may be among the cached raw paths.
+        self._existing_raw_paths.clear()
+
     def find_observation_group_id(
         self, group_identifier: str, telescope: types.Telescope
     ) -> Optional[int]:
@@ -91,6 +157,13 @@ class SSDADatabaseService:
 
         """
 
+        # Consecutive FITS files usually belong to the same observation group, so the
+        # ids are cached. Only existing observation groups are cached, as a missing
+        # group might be inserted later on.
+        key = (group_identifier, telescope)
+        if key in self._observation_group_ids:
+            return self._observation_group_ids[key]
+
         with self._connection.cursor() as cur:
             sql = """
             SELECT observations.observation.observation_group_id
@@ -106,7 +179,8 @@ class SSDADatabaseService:
 
             observation_group_id = cur.fetchone()
             if observation_group_id:
-                return cast(int, observation_group_id[0])
+                self._observation_group_ids[key] = cast(int, observation_group_id[0])
+                return self._observation_group_ids[key]
             else:
                 return None
 
@@ -135,7 +209,9 @@ class SSDADatabaseService:
             JOIN observations.artifact ON observations.plane.plane_id = observations.artifact.plane_id
             WHERE (paths).raw=%(artifact_path)s
             """
-            cur.execute(sql, dict(artifact_path=artifact_path))
+            self._execute_prepared(
+                cur, "find_observation_id", sql, dict(artifact_path=artifact_path)
+            )
 
             observation_id = cur.fetchone()
             if observation_id:
@@ -167,23 +243,33 @@ class SSDADatabaseService:
         if proposal_id is None:
             return None
 
-        # Released data is owned by nobody
-        data_release = self._find_data_release_date_for_plane(plane_id)
-        if data_release <= datetime.now().date():
-            return None
-
+        # The release date and the investigators are queried together, to save a
+        # database round trip per file.
         with self._connection.cursor() as cur:
             sql = """
-                SELECT array_agg(institution_user_id)
-                FROM proposal_investigator
-                WHERE proposal_id=%(proposal_id)s
+                SELECT observation.data_release,
+                       (SELECT array_agg(institution_user_id)
+                        FROM proposal_investigator
+                        WHERE proposal_id=%(proposal_id)s)
+                FROM observation
+                JOIN plane ON observation.observation_id = plane.observation_id
+                WHERE plane.plane_id=%(plane_id)s
                 """
-            cur.execute(sql, dict(proposal_id=proposal_id))
-            result = cur.fetchone()
+            self._execute_prepared(
+                cur,
+                "find_owner_institution_user_ids",
+                sql,
+                dict(plane_id=plane_id, proposal_id=proposal_id),
+            )
+            data_release, institution_user_ids = cur.fetchone()
 
-            # Proposals without an investigator are deemed public. An example of this
-            # are gravitational wave proposals for SALT.
-            return result[0] if len(result[0]) else None
+        # Released data is owned by nobody
+        if cast(date, data_release) <= datetime.now().date():
+            return None
+
+        # Proposals without an investigator are deemed public. An example of this
+        # are gravitational wave proposals for SALT.
+        return institution_user_ids if institution_user_ids else None
 
     def find_proposal_investigator_user_ids(
         self, proposal_code: str, institution: types.Institution
@@ -263,31 +349,6 @@ WHERE proposal_code=%(proposal_code)s AND name=%(institution)s
             )
             return cur.fetchone()
 
-    def _find_data_release_date_for_plane(self, plane_id) -> date:
-        """
-        Find the release date for the data of a plane.
-
-        Parameters
-        ----------
-        plane_id : int
-            Plane id.
-
-        Returns
-        -------
-        date
-            Release date
-        """
-        with self._connection.cursor() as cur:
-            sql = """
-                SELECT observation.data_release
-                FROM observation
-                JOIN plane ON observation.observation_id = plane.observation_id
-                WHERE plane.plane_id=%(plane_id)s;
-                """
-            cur.execute(sql, dict(plane_id=plane_id))
-            result = cur.fetchone()
-            return cast(date, result[0])
-
     def find_proposal_id(
         self, proposal_code: str, institution: types.Institution
     ) -> Optional[int]:
@@ -309,6 +370,13 @@ WHERE proposal_code=%(proposal_code)s AND name=%(institution)s
 
         """
 
+        # Most FITS files of a night belong to the same few proposals, so the ids are
+        # cached. Only existing proposals are cached, as a missing proposal might be
+        # inserted later on.
+        key = (proposal_code, institution)
+        if key in self._proposal_ids:
+            return self._proposal_ids[key]
+
         with self._connection.cursor() as cur:
             sql = """
             SELECT proposal_id
@@ -321,14 +389,18 @@ WHERE proposal_code=%(proposal_code)s AND name=%(institution)s
             )
             result = cur.fetchone()
             if result:
-                return cast(int, result[0])
+                self._proposal_ids[key] = cast(int, result[0])
+                return self._proposal_ids[key]
             else:
                 return None
 
-    def find_file_paths(self, nights: types.DateRange, ) -> List[str]:
+    def find_file_paths(self, nights: types.DateRange, ) -> Iterator[str]:
         """
         The file paths for the observations made in a date range. The start date and the end date are inclusive.
 
+        The paths are streamed from a server-side cursor, so that they don't have to be
+        held in memory all at once. This requires an open transaction.
+
         Parameters
         ----------
         nights : DateRange
@@ -336,28 +408,30 @@ WHERE proposal_code=%(proposal_code)s AND name=%(institution)s
 
         Returns
         -------
-        The observation file paths.
+        An iterator with the observation file paths.
 
         """
-        paths = []
+        patterns = []
         night = nights.start
         while night <= nights.end:
-            str_night = "%" + str(night).replace("-", "") + "%"
-            with self._connection.cursor() as cur:
-                sql = f"""
+            patterns.append("%" + str(night).replace("-", "") + "%")
+            night += timedelta(days=1)
+
+        # All nights are covered by a single query.
+        with self._connection.cursor(name="file_paths") as cur:
+            sql = """
 SELECT (paths).raw
 FROM observations.observation
     JOIN observations.plane ON observations.observation.observation_id = observations.plane.observation_id
     JOIN observations.observation_time ON observations.plane.plane_id = observations.observation_time.plane_id
     JOIN observations.artifact ON observations.plane.plane_id = observations.artifact.plane_id
-WHERE artifact.name LIKE '{str_night}';
+WHERE artifact.name LIKE ANY(%(patterns)s)
+ORDER BY (paths).raw
             """
-                cur.execute(sql)
+            cur.execute(sql, dict(patterns=patterns))
 
-                observation_paths = cur.fetchall()
-                night += timedelta(days=1)
-                paths += [cast(str, obs[0]) for obs in observation_paths]
-        return paths
+            for obs in cur:
+                yield cast(str, obs[0])
 
     def find_salt_observation_group(
         self, proposal_code: str
@@ -410,6 +484,12 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         """
         Check if the FITS file already exists.
 
+        The raw paths of all the files in the same directory are read from the database
+        when a file in that directory is checked for the first time. Checking the
+        other files in the directory thus requires no further database access. Only
+        the paths for the two most recently loaded directories are kept, so that files
+        may be checked a little ahead of the file being inserted.
+
         Parameters
         ----------
         path : str
@@ -419,14 +499,58 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         -------
         bool
 
+        Raises
+        ------
+        ValueError
+            If the file is not in the FITS base directory.
+
+        """
+
+        raw_path = fits_file_path_relative_to_base_dir(path)
+        directory = os.path.dirname(raw_path)
+        if directory not in self._existing_raw_paths:
+            if len(self._existing_raw_paths) >= 2:
+                oldest_directory = next(iter(self._existing_raw_paths))
+                del self._existing_raw_paths[oldest_directory]
+            # The query is run in a nested transaction, so that a failing query does
+            # not abort the enclosing transaction.
+            self.begin_transaction()
+            try:
+                self._existing_raw_paths[directory] = self._find_raw_paths(directory)
+                self.commit_transaction()
+            except BaseException as e:
+                self.rollback_transaction()
+                raise e
+
+        return raw_path in self._existing_raw_paths[directory]
+
+    def _find_raw_paths(self, directory: str) -> Set[str]:
         """
+        Find the raw paths of the artifacts in a directory.
+
+        Parameters
+        ----------
+        directory : str
+            Directory, relative to the FITS base directory.
 
+        Returns
+        -------
+        Set[str]
+            The raw paths.
+
+        """
+
+        # Escape the characters which have a special meaning in LIKE patterns.
+        pattern = (
+            directory.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "/%"
+        )
         with self._connection.cursor() as cur:
             sql = """
-            SELECT EXISTS(SELECT 1 FROM observations.artifact WHERE (paths).raw=%(path)s);
+            SELECT (paths).raw FROM observations.artifact WHERE (paths).raw LIKE %(pattern)s
             """
-            cur.execute(sql, dict(path=os.path.relpath(path, get_fits_base_dir())))
-            return cur.fetchone()[0]
+            cur.execute(sql, dict(pattern=pattern))
+            return set(cast(str, row[0]) for row in cur.fetchall())
 
     def insert_proposal_access_rule(
         self, proposal_id: int, access_rule: Optional[types.AccessRule]
@@ -442,10 +566,13 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
                 WHERE access_rule=%(access_rule)s
             )
             INSERT INTO admin.proposal_access_rule (proposal_id, access_rule_id)
-            VALUES (%(proposal_id)s, (SELECT id FROM ar));
+            VALUES (%(proposal_id)s, (SELECT id FROM ar))
             """
-            cur.execute(
-                sql, dict(proposal_id=proposal_id, access_rule=access_rule.value)
+            self._execute_prepared(
+                cur,
+                "insert_proposal_access_rule",
+                sql,
+                dict(proposal_id=proposal_id, access_rule=access_rule.value),
             )
 
     def insert_artifact(self, artifact: types.Artifact) -> int:
@@ -488,7 +615,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING artifact_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_artifact",
                 sql,
                 dict(
                     content_checksum=artifact.content_checksum,
@@ -542,7 +671,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING energy_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_energy",
                 sql,
                 dict(
                     dimension=energy.dimension,
@@ -592,21 +723,28 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         """
 
+        if not institution_memberships:
+            return
+
         sql = """
         INSERT INTO institution_membership (institution_user_id, membership_end, membership_start)
-        VALUES (%(institution_user_id)s, %(membership_end)s, %(membership_start)s)
+        VALUES %s
         """
 
+        # All memberships are inserted with a single statement.
         with self._connection.cursor() as cur:
-            for institution_membership in institution_memberships:
-                cur.execute(
-                    sql,
-                    dict(
-                        institution_user_id=institution_user_id,
-                        membership_end=institution_membership.membership_end,
-                        membership_start=institution_membership.membership_start,
-                    ),
-                )
+            execute_values(
+                cur,
+                sql,
+                [
+                    (
+                        institution_user_id,
+                        institution_membership.membership_end,
+                        institution_membership.membership_start,
+                    )
+                    for institution_membership in institution_memberships
+                ],
+            )
 
     def update_institution_memberships(
         self,
@@ -627,11 +765,59 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         """
 
-        self.delete_institution_memberships(institution_user_id)
-        self.insert_institution_memberships(
-            institution_user_id, institution_memberships
+        self._replace_institution_memberships(
+            {institution_user_id: institution_memberships}
         )
 
+    def _replace_institution_memberships(
+        self, institution_memberships: Dict[int, List[types.InstitutionMembership]]
+    ) -> None:
+        """
+        Replace the membership details of institution users.
+
+        The existing membership details of all the institution users are deleted with a
+        single statement, and the new ones are inserted with another.
+
+        Parameters
+        ----------
+        institution_memberships : Dict[int, List[InstitutionMembership]]
+            Membership details, keyed by institution user id.
+
+        """
+
+        if not institution_memberships:
+            return
+
+        sql = """
+        DELETE FROM admin.institution_membership
+        WHERE institution_user_id = ANY(%(institution_user_ids)s)
+        """
+
+        with self._connection.cursor() as cur:
+            cur.execute(
+                sql, dict(institution_user_ids=list(institution_memberships.keys()))
+            )
+
+        values = [
+            (
+                institution_user_id,
+                institution_membership.membership_end,
+                institution_membership.membership_start,
+            )
+            for institution_user_id, memberships in institution_memberships.items()
+            for institution_membership in memberships
+        ]
+        if not values:
+            return
+
+        sql = """
+        INSERT INTO institution_membership (institution_user_id, membership_end, membership_start)
+        VALUES %s
+        """
+
+        with self._connection.cursor() as cur:
+            execute_values(cur, sql, values)
+
     def insert_institution_user(
         self, user_id: str, institution: types.Institution
     ) -> int:
@@ -654,41 +840,45 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         """
 
+        # Investigators usually are on many proposals, so the ids are cached.
+        key = (user_id, institution)
+        if key in self._institution_user_ids:
+            return self._institution_user_ids[key]
+
         with self._connection.cursor() as cur:
             # Insert the institution user (if they don't exist yet).
             # It is safe to assume that ssda_user_id is NULL for a new institution user;
             # a non-NULL value would mean that the institution user exists already, as
             # it would have been created during registration.
+            # If the user exists already, the insert returns no row, and the id is
+            # taken from the existing row instead. As both parts of the query use the
+            # same snapshot, exactly one of them returns the id.
             sql = """
-            WITH inst (institution_id) AS (
-                SELECT institution_id FROM observations.institution WHERE name=%(institution)s
+            WITH new_user (institution_user_id) AS (
+                INSERT INTO admin.institution_user (institution_id, user_id)
+                VALUES (%(institution_id)s, %(user_id)s)
+                ON CONFLICT (user_id, institution_id)
+                DO NOTHING
+                RETURNING institution_user_id
             )
-            INSERT INTO admin.institution_user (institution_id, user_id)
-            VALUES ((SELECT institution_id FROM inst), %(user_id)s)
-            ON CONFLICT (user_id, institution_id)
-            DO NOTHING
-            RETURNING institution_user_id
+            SELECT institution_user_id FROM new_user
+            UNION ALL
+            SELECT institution_user_id FROM admin.institution_user
+            WHERE institution_id=%(institution_id)s AND user_id=%(user_id)s
             """
 
-            cur.execute(sql, dict(institution=institution.value, user_id=user_id))
-
-            result = cur.fetchone()
-            if result:
-                return cast(int, result[0])
-            else:
-                sql = """
-                WITH inst (institution_id) AS (
-                    SELECT institution_id FROM observations.institution WHERE name=%(institution)s
-                )
-                SELECT institution_user_id FROM admin.institution_user
-                WHERE institution_id=(SELECT institution_id FROM inst) AND user_id=%(user_id)s
-                """
-
-                cur.execute(sql, dict(institution=institution.value, user_id=user_id))
-
-                result = cur.fetchone()
+            cur.execute(
+                sql,
+                dict(
+                    institution_id=self._find_lookup_id(
+                        "institution", institution.value
+                    ),
+                    user_id=user_id,
+                ),
+            )
 
-                return cast(int, result[0])
+            self._institution_user_ids[key] = cast(int, cur.fetchone()[0])
+            return self._institution_user_ids[key]
 
     def insert_instrument_keyword_value(
         self, instrument_keyword_value: types.InstrumentKeywordValue
@@ -701,40 +891,54 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         instrument_keyword_value : InstrumentKeywordValue
             Instrument keyword value.
 
-        Returns
-        -------
-        int
-            Database id of the inserted instrument keyword value.
+        """
+
+        self.insert_instrument_keyword_values([instrument_keyword_value])
+
+    def insert_instrument_keyword_values(
+        self, instrument_keyword_values: List[types.InstrumentKeywordValue]
+    ) -> None:
+        """
+        Insert instrument keyword values.
 
+        All the values are inserted with a single statement.
+
+        Parameters
+        ----------
+        instrument_keyword_values : List[InstrumentKeywordValue]
+            Instrument keyword values.
+
+        """
+
+        if not instrument_keyword_values:
+            return
+
+        sql = """
+        INSERT INTO observations.instrument_keyword_value (instrument_id,
+                                              instrument_keyword_id,
+                                              observation_id,
+                                              value)
+        VALUES %s
         """
 
         with self._connection.cursor() as cur:
-            sql = """
-            WITH instr (instrument_id) AS (
-                SELECT instrument_id FROM observations.instrument WHERE name=%(instrument)s
-            ),
-            ik (instrument_keyword_id) AS (
-                SELECT instrument_keyword_id
-                FROM observations.instrument_keyword
-                WHERE keyword=%(keyword)s
-            )
-            INSERT INTO observations.instrument_keyword_value (instrument_id,
-                                                  instrument_keyword_id,
-                                                  observation_id,
-                                                  value)
-            VALUES ((SELECT instrument_id FROM instr),
-                    (SELECT instrument_keyword_id FROM ik),
-                    %(observation_id)s,
-                    %(value)s)
-            """
-            cur.execute(
+            execute_values(
+                cur,
                 sql,
-                dict(
-                    instrument=instrument_keyword_value.instrument.value,
-                    keyword=instrument_keyword_value.instrument_keyword.value,
-                    observation_id=instrument_keyword_value.observation_id,
-                    value=instrument_keyword_value.value,
-                ),
+                [
+                    (
+                        self._find_lookup_id(
+                            "instrument", instrument_keyword_value.instrument.value
+                        ),
+                        self._find_lookup_id(
+                            "instrument_keyword",
+                            instrument_keyword_value.instrument_keyword.value,
+                        ),
+                        instrument_keyword_value.observation_id,
+                        instrument_keyword_value.value,
+                    )
+                    for instrument_keyword_value in instrument_keyword_values
+                ],
             )
 
     def insert_instrument_setup(self, instrument_setup: types.InstrumentSetup) -> int:
@@ -777,7 +981,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING instrument_setup_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_instrument_setup",
                 sql,
                 dict(
                     detector_mode=instrument_setup.detector_mode.value,
@@ -798,6 +1004,8 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         Insert instrument-specific content.
 
         The method executes the given SQL statement with the supplied query parameters.
+        As the same few statements are executed for all the files of an instrument,
+        each distinct statement is prepared once and reused.
 
         Parameters
         ----------
@@ -808,8 +1016,14 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         """
 
+        statement_names = self._instrument_specific_statement_names
+        if sql not in statement_names:
+            statement_names[sql] = (
+                f"insert_instrument_specific_content_{len(statement_names) + 1}"
+            )
+
         with self._connection.cursor() as cur:
-            cur.execute(sql, parameters)
+            self._execute_prepared(cur, statement_names[sql], sql, parameters)
 
     def insert_observation(self, observation: types.Observation) -> int:
         """
@@ -829,18 +1043,6 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         with self._connection.cursor() as cur:
             sql = """
-            WITH instr (instrument_id) AS (
-                SELECT instrument_id FROM observations.instrument WHERE name=%(instrument)s
-            ),
-            i (intent_id) AS (
-                SELECT intent_id FROM observations.intent WHERE observations.intent.intent=%(intent)s
-            ),
-            st (status_id) AS (
-                SELECT status_id FROM observations.status WHERE observations.status.status=%(status)s
-            ),
-            tel (telescope_id) AS (
-                SELECT telescope_id FROM observations.telescope WHERE name=%(telescope)s
-            )
             INSERT INTO observations.observation (data_release,
                                      instrument_id,
                                      intent_id,
@@ -851,32 +1053,51 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
                                      telescope_id)
             VALUES (
                 %(data_release)s,
-                (SELECT instrument_id FROM instr),
-                (SELECT intent_id FROM i),
+                %(instrument_id)s,
+                %(intent_id)s,
                 %(meta_release)s,
                 %(observation_group_id)s,
                 %(proposal_id)s,
-                (SELECT status_id FROM st),
-                (SELECT telescope_id FROM tel)
+                %(status_id)s,
+                %(telescope_id)s
             )
             RETURNING observation.observation_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_observation",
                 sql,
                 dict(
                     data_release=observation.data_release,
-                    instrument=observation.instrument.value,
-                    intent=observation.intent.value,
+                    instrument_id=self._find_lookup_id(
+                        "instrument", observation.instrument.value
+                    ),
+                    intent_id=self._find_lookup_id("intent", observation.intent.value),
                     meta_release=observation.meta_release,
                     observation_group_id=observation.observation_group_id,
                     proposal_id=observation.proposal_id,
-                    status=observation.status.value,
-                    telescope=observation.telescope.value,
+                    status_id=self._find_lookup_id("status", observation.status.value),
+                    telescope_id=self._find_lookup_id(
+                        "telescope", observation.telescope.value
+                    ),
                 ),
             )
 
-            return cast(int, cur.fetchone()[0])
+            observation_id = cast(int, cur.fetchone()[0])
+
+        # An observation group can only be found once it has an observation, so this
+        # is the first opportunity to cache the id of a newly inserted group.
+        group_identifier = self._new_observation_group_identifiers.pop(
+            observation.observation_group_id, None
+        )
+        if group_identifier is not None:
+            key = (group_identifier, observation.telescope)
+            self._observation_group_ids[key] = cast(
+                int, observation.observation_group_id
+            )
+
+        return observation_id
 
     def insert_observation_group(
         self, observation_group: types.ObservationGroup
@@ -904,7 +1125,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING observation_group_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_observation_group",
                 sql,
                 dict(
                     group_identifier=observation_group.group_identifier,
@@ -912,7 +1135,12 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
                 ),
             )
 
-            return cast(int, cur.fetchone()[0])
+            observation_group_id = cast(int, cur.fetchone()[0])
+            self._new_observation_group_identifiers[
+                observation_group_id
+            ] = observation_group.group_identifier
+
+            return observation_group_id
 
     def insert_observation_time(self, observation_time: types.ObservationTime) -> int:
         """
@@ -946,7 +1174,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING observation_time_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_observation_time",
                 sql,
                 dict(
                     end_time=observation_time.end_time,
@@ -989,7 +1219,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING plane_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_plane",
                 sql,
                 dict(
                     observation_id=plane.observation_id,
@@ -1025,7 +1257,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             VALUES (%(plane_id)s, (SELECT polarization_mode_id FROM pp))
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_polarization",
                 sql,
                 dict(
                     plane_id=polarization.plane_id,
@@ -1064,7 +1298,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             RETURNING position_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_position",
                 sql,
                 dict(
                     dec=position.dec.to_value(u.degree),
@@ -1081,6 +1317,9 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         """
         Insert a proposal.
 
+        If the proposal has been inserted by someone else since it was looked up, the
+        existing proposal is left unchanged, and its database id is returned.
+
         Parameters
         ----------
         proposal : proposal
@@ -1095,26 +1334,29 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         with self._connection.cursor() as cur:
             sql = """
-            WITH inst (institution_id) AS (
-                SELECT institution_id FROM observations.institution WHERE name=%(institution)s
-            ),
-            pt (proposal_type_id) AS (
+            WITH pt (proposal_type_id) AS (
                 SELECT proposal_type_id FROM observations.proposal_type WHERE proposal_type=%(proposal_type)s
             )
             INSERT INTO observations.proposal (institution_id, pi, proposal_code, proposal_type_id, title)
             VALUES (
-                (SELECT institution_id FROM inst),
+                %(institution_id)s,
                 %(pi)s,
                 %(proposal_code)s,
                 (SELECT proposal_type_id FROM pt),
                 %(title)s
             )
+            ON CONFLICT (proposal_code, institution_id)
+                DO UPDATE SET proposal_code=EXCLUDED.proposal_code
             RETURNING proposal_id
             """
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_proposal",
                 sql,
                 dict(
-                    institution=proposal.institution.value,
+                    institution_id=self._find_lookup_id(
+                        "institution", proposal.institution.value
+                    ),
                     pi=proposal.pi,
                     proposal_code=proposal.proposal_code,
                     proposal_type=proposal.proposal_type.value,
@@ -1122,7 +1364,11 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
                 ),
             )
 
-            return cast(int, cur.fetchone()[0])
+            proposal_id = cast(int, cur.fetchone()[0])
+            key = (proposal.proposal_code, proposal.institution)
+            self._proposal_ids[key] = proposal_id
+
+            return proposal_id
 
     def insert_proposal_investigator(
         self, proposal_investigator: types.ProposalInvestigator
@@ -1135,29 +1381,53 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             Proposal investigator.
         """
 
-        # insert institution user if not exist
-        institution_user_id = self.insert_institution_user(
-            proposal_investigator.investigator_id, proposal_investigator.institution
-        )
+        self.insert_proposal_investigators([proposal_investigator])
+
+    def insert_proposal_investigators(
+        self, proposal_investigators: List[types.ProposalInvestigator]
+    ) -> None:
+        """
+        Insert proposal investigators.
+
+        The institution users are inserted one by one, but the membership details of
+        all of them are replaced together and the proposal investigators are inserted
+        with a single statement. Investigators who already are on a proposal are
+        ignored.
+
+        Parameters
+        ----------
+        proposal_investigators : List[ProposalInvestigator]
+            Proposal investigators.
+        """
+
+        values = []
+        institution_memberships: Dict[int, List[types.InstitutionMembership]] = {}
+        for proposal_investigator in proposal_investigators:
+            # insert institution user if not exist
+            institution_user_id = self.insert_institution_user(
+                proposal_investigator.investigator_id,
+                proposal_investigator.institution,
+            )
+
+            institution_memberships[
+                institution_user_id
+            ] = proposal_investigator.institution_memberships
+            values.append((institution_user_id, proposal_investigator.proposal_id))
+
+        if not values:
+            return
 
         # update membership details
-        self.update_institution_memberships(
-            institution_user_id, proposal_investigator.institution_memberships
-        )
+        self._replace_institution_memberships(institution_memberships)
 
         with self._connection.cursor() as cur:
             sql = """
             INSERT INTO admin.proposal_investigator (institution_user_id, proposal_id)
-            VALUES (%(institution_user_id)s, %(proposal_id)s)
+            VALUES %s
+            ON CONFLICT (proposal_id, institution_user_id) DO NOTHING
             """
 
-            cur.execute(
-                sql,
-                dict(
-                    institution_user_id=institution_user_id,
-                    proposal_id=proposal_investigator.proposal_id,
-                ),
-            )
+            execute_values(cur, sql, values)
 
     def insert_target(self, target: types.Target) -> int:
         """
@@ -1177,29 +1447,78 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
 
         with self._connection.cursor() as cur:
             sql = """
-            WITH tt (target_type_id) AS (
-                SELECT target_type_id FROM observations.target_type WHERE numeric_code=%(numeric_code)s
-            )
             INSERT INTO observations.target (name, observation_id, standard, target_type_id)
             VALUES (%(name)s,
                     %(observation_id)s,
                     %(standard)s,
-                    (SELECT tt.target_type_id FROM tt))
+                    %(target_type_id)s)
             RETURNING target_id
             """
 
-            cur.execute(
+            self._execute_prepared(
+                cur,
+                "insert_target",
                 sql,
                 dict(
                     name=target.name,
                     observation_id=target.observation_id,
                     standard=target.standard,
-                    numeric_code=target.target_type,
+                    target_type_id=self._find_lookup_id(
+                        "target_type", target.target_type
+                    ),
                 ),
             )
 
             return cast(int, cur.fetchone()[0])
 
+    def _find_lookup_id(self, table: str, value: Optional[str]) -> Optional[int]:
+        """
+        Find the database id of a value in a lookup table.
+
+        A lookup table is read from the database when a value is requested from it for
+        the first time, and it is read again if a value is not found, as the value
+        might have been added since. A value which is still not found is remembered as
+        missing, and the table is not read again for it until the outermost
+        transaction ends.
+
+        Parameters
+        ----------
+        table : str
+            Name of the lookup table. The value and id column of the table must be
+            defined in the _LOOKUP_TABLES dictionary.
+        value : Optional[str]
+            Value.
+
+        Returns
+        -------
+        Optional[int]
+            The database id, or None if the value is None or does not exist in the
+            table.
+
+        """
+
+        if value is None:
+            return None
+
+        missing_values = self._missing_lookup_values.setdefault(table, set())
+        if value in missing_values:
+            return None
+
+        if value not in self._lookup_ids.get(table, {}):
+            value_column, id_column = _LOOKUP_TABLES[table]
+            with self._connection.cursor() as cur:
+                sql = f"""
+                SELECT {value_column}, {id_column} FROM observations.{table}
+                """
+                cur.execute(sql)
+                self._lookup_ids[table] = {
+                    row[0]: cast(int, row[1]) for row in cur.fetchall()
+                }
+            if value not in self._lookup_ids[table]:
+                missing_values.add(value)
+
+        return self._lookup_ids[table].get(value)
+
     def update_investigators(
         self,
         proposal_code: str,
@@ -1207,7 +1526,13 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
         proposal_investigators: List[types.ProposalInvestigator],
     ):
         """
-        Update the investigators for a proposal. Existing investigators are deleted.
+        Update the investigators for a proposal.
+
+        Only the difference between the existing and the new investigators is applied:
+        new investigators are added, and investigators who are not on the proposal any
+        longer are removed. This is done within a single transaction, so that the
+        investigators are either updated completely or not at all.
+
         Parameters
         ----------
         proposal_code : str
@@ -1218,32 +1543,56 @@ WHERE proposal_code=%(proposal_code)s AND telescope_id = (SELECT telescope_id FR
             New proposal investigators.
         """
 
-        with self._connection.cursor() as cur:
-            sql = """
+        sql = """
 WITH prop_id (proposal_id) AS (
     SELECT proposal_id
     FROM proposal
         JOIN institution on proposal.institution_id = institution.institution_id
     WHERE proposal_code=%(proposal_code)s AND name=%(institution)s
-)
+),
+     investigator_ids (institution_user_id) AS (
+         SELECT institution_user_id
+         FROM admin.institution_user
+             JOIN institution ON institution_user.institution_id = institution.institution_id
+         WHERE name=%(institution)s AND user_id = ANY(%(investigator_ids)s)
+     )
 DELETE FROM admin.proposal_investigator
 WHERE proposal_id = (SELECT proposal_id FROM prop_id)
-            """
-            cur.execute(
-                sql, dict(proposal_code=proposal_code, institution=institution.value)
-            )
-            proposal_investigators_str = ""
-            for proposal_investigator in proposal_investigators:
-                self.insert_proposal_investigator(
-                    proposal_investigator=proposal_investigator
-                )
-                proposal_investigators_str += (
-                    proposal_investigator.investigator_id + ", "
+  AND institution_user_id NOT IN (SELECT institution_user_id FROM investigator_ids)
+        """
+
+        self.begin_transaction()
+
+        try:
+            # Investigators who already are on the proposal are ignored.
+            self.insert_proposal_investigators(proposal_investigators)
+
+            with self._connection.cursor() as cur:
+                cur.execute(
+                    sql,
+                    dict(
+                        proposal_code=proposal_code,
+                        institution=institution.value,
+                        investigator_ids=[
+                            proposal_investigator.investigator_id
+                            for proposal_investigator in proposal_investigators
+                        ],
+                    ),
                 )
-            info_log.info(
-                msg=f"The investigator ids for {proposal_code} have been changed to "
-                f"{proposal_investigators_str[:-2] + '.'}"
-            )
+
+            self.commit_transaction()
+        except BaseException as e:
+            self.rollback_transaction()
+            raise e
+
+        proposal_investigators_str = ", ".join(
+            proposal_investigator.investigator_id
+            for proposal_investigator in proposal_investigators
+        )
+        info_log.info(
+            msg=f"The investigator ids for {proposal_code} have been changed to "
+            f"{proposal_investigators_str + '.'}"
+        )
 
     def update_observation_group_status(
         self, group_identifier: str, status: types.Status, telescope: types.Telescope
@@ -1260,32 +1609,53 @@ WHERE proposal_id = (SELECT proposal_id FROM prop_id)
             Telescope used for observing the group.
         """
 
-        with self._connection.cursor() as cur:
-            sql = """
-WITH
-    obs_id (observation_group_id) AS (
-        SELECT DISTINCT observation_group.observation_group_id FROM observation_group
-            JOIN observation ON observation_group.observation_group_id=observation.observation_group_id
-            JOIN telescope ON observation.telescope_id = telescope.telescope_id
-        WHERE group_identifier=%(group_identifier)s AND telescope.name=%(telescope)s
-    ),
-    stat (status_id) AS (
-        SELECT status_id
-        FROM observations.status
-        WHERE status=%(status)s
-    )
+        self.update_observation_group_statuses({group_identifier: status}, telescope)
+
+    def update_observation_group_statuses(
+        self, statuses: Dict[str, types.Status], telescope: types.Telescope
+    ) -> None:
+        """
+        Update the status of all observations in several observation groups.
+
+        The observations of all the groups are updated with a single statement.
+
+        Parameters
+        ----------
+        statuses : Dict[str, Status]
+            New statuses, keyed by observation group identifier.
+        telescope : Telescope
+            Telescope used for observing the groups.
+        """
+
+        if not statuses:
+            return
+
+        sql = """
 UPDATE observation
-SET status_id=(SELECT status_id FROM stat)
-WHERE observation_group_id=(SELECT observation_group_id FROM obs_id)
-            """
-            cur.execute(
+SET status_id=new_status.status_id
+FROM observation_group,
+     (VALUES %s) AS new_status (group_identifier, status_id, telescope_id)
+WHERE observation.observation_group_id=observation_group.observation_group_id
+  AND observation_group.group_identifier=new_status.group_identifier
+  AND observation.telescope_id=new_status.telescope_id
+        """
+
+        telescope_id = self._find_lookup_id("telescope", telescope.value)
+        with self._connection.cursor() as cur:
+            execute_values(
+                cur,
                 sql,
-                dict(
-                    group_identifier=group_identifier,
-                    status=status.value,
-                    telescope=telescope.value,
-                ),
+                [
+                    (
+                        group_identifier,
+                        self._find_lookup_id("status", status.value),
+                        telescope_id,
+                    )
+                    for group_identifier, status in statuses.items()
+                ],
             )
+
+        for group_identifier, status in statuses.items():
             info_log.info(
                 msg=f"The status of block visit id {group_identifier} has changed to {status.value}"
             )
@@ -1354,4 +1724,82 @@ WHERE proposal_id=%(proposal_id)s
 
         """
 
-        self._connection.rollback()
+        # Proposals, observation groups and institution users inserted during the
+        # transaction don't exist any longer.
+        self._proposal_ids.clear()
+        self._institution_user_ids.clear()
+        self._observation_group_ids.clear()
+        self._new_observation_group_identifiers.clear()
+
+        # Neither do the artifacts inserted before the raw paths were cached.
+        if self._transaction_depth <= 1:
+            self._existing_raw_paths.clear()
+
+        if self._transaction_depth > 0:
+            self._transaction_depth -= 1
+        if self._transaction_depth > 0:
+            with self._connection.cursor() as cur:
+                cur.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint()}")
+                cur.execute(f"RELEASE SAVEPOINT {self._savepoint()}")
+        else:
+            self._connection.rollback()
+
+            # Lookup values might have been added by others in the meantime.
+            self._missing_lookup_values.clear()
+
+    def _execute_prepared(
+        self, cur: Any, name: str, sql: str, parameters: Dict[str, Any]
+    ) -> None:
+        """
+        Execute an SQL statement as a prepared statement.
+
+        The statement is prepared when it is executed for the first time, so that
+        PostgreSQL parses and plans it only once per connection. The EXECUTE statement
+        for it is built at the same time and reused. The query parameters must be
+        included in the form %(name)s in the SQL statement.
+
+        Parameters
+        ----------
+        cur : cursor
+            Database cursor.
+        name : str
+            Name of the prepared statement.
+        sql : str
+            SQL statement.
+        parameters : Dict[str, any]
+            Query parameters.
+
+        """
+
+        if name not in self._prepared_statements:
+            parameter_names: List[str] = []
+
+            def positional_parameter(match: Any) -> str:
+                if match.group(1) not in parameter_names:
+                    parameter_names.append(match.group(1))
+                return f"${parameter_names.index(match.group(1)) + 1}"
+
+            cur.execute(
+                f"PREPARE {name} AS {_QUERY_PARAMETER.sub(positional_parameter, sql)}"
+            )
+            placeholders = ", ".join(["%s"] * len(parameter_names))
+            self._prepared_statements[name] = (
+                f"EXECUTE {name} ({placeholders})",
+                parameter_names,
+            )
+
+        execute_sql, parameter_names = self._prepared_statements[name]
+        cur.execute(execute_sql, [parameters[p] for p in parameter_names])
+
+    def _savepoint(self) -> str:
+        """
+        The name of the savepoint for the current nested transaction.
+
+        Returns
+        -------
+        str
+            The savepoint name.
+
+        """
+
+        return f"nested_transaction_{self._transaction_depth}"
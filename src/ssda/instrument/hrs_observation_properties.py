@@ -6,13 +6,58 @@ from ssda.util import types
 from ssda.util.salt_energy_calculation import hrs_spectral_properties
 from ssda.util.salt_observation import SALTObservation
 from ssda.util.fits import FitsFile
-from typing import Optional, List
+from typing import Dict, Optional, List
+
+# The HRS modes for the (uppercase) OBSMODE header values
+_HRS_MODES: Dict[str, types.HRSMode] = {
+    "LOW RESOLUTION": types.HRSMode.LOW_RESOLUTION,
+    "MEDIUM RESOLUTION": types.HRSMode.MEDIUM_RESOLUTION,
+    "HIGH RESOLUTION": types.HRSMode.HIGH_RESOLUTION,
+    "HIGH STABILITY": types.HRSMode.HIGH_STABILITY,
+    "INT CAL FIBRE": types.HRSMode.INT_CAL_FIBRE,
+}
+
+# SQL for inserting the HRS-specific part of an instrument setup
+_HRS_SETUP_SQL = """
+WITH hm (id) AS (
+    SELECT hrs_mode_id FROM observations.hrs_mode
+           WHERE hrs_mode.hrs_mode=%(hrs_mode)s
+)
+INSERT INTO observations.hrs_setup (instrument_setup_id, hrs_mode_id)
+VALUES (%(instrument_setup_id)s, (SELECT id FROM hm))
+"""
 
 
 class HrsObservationProperties(ObservationProperties):
+    __slots__ = (
+        "_arm",
+        "_detmode",
+        "_hrs_mode",
+        "_obsmode",
+        "database_service",
+        "file_path",
+        "header_value",
+        "salt_observation",
+    )
+
     def __init__(self, fits_file: FitsFile, database_service: SaltDatabaseService):
         self.header_value = fits_file.header_value
         self.file_path = fits_file.file_path()
+        # The arm is given by the first letter of the file name.
+        first_letter = os.path.basename(self.file_path)[:1]
+        self._arm = (
+            types.HRSArm.RED
+            if first_letter == "R"
+            else types.HRSArm.BLUE
+            if first_letter == "H"
+            else None
+        )
+        # The header values needed for the mode and detector mode are looked up only
+        # once, as they are used by more than one method.
+        obsmode_header_value = self.header_value("OBSMODE")
+        self._obsmode = obsmode_header_value.upper() if obsmode_header_value else ""
+        self._detmode = self.header_value("DETMODE") or ""
+        self._hrs_mode: Optional[types.HRSMode] = None
         self.database_service = database_service
         self.salt_observation = SALTObservation(
             fits_file=fits_file, database_service=database_service
@@ -28,18 +73,10 @@ class HrsObservationProperties(ObservationProperties):
         if self.salt_observation.is_calibration():
             return None
 
-        filename = str(os.path.basename(self.file_path))
-        arm = (
-            types.HRSArm.RED
-            if filename[0] == "R"
-            else types.HRSArm.BLUE
-            if filename[0] == "H"
-            else None
-        )
-        if not arm:
+        if not self._arm:
             raise ValueError("Unknown arm.")
         hrs_mode = self._mode()
-        return hrs_spectral_properties(plane_id, arm, hrs_mode)
+        return hrs_spectral_properties(plane_id, self._arm, hrs_mode)
 
     def ignore_observation(self) -> bool:
         return self.salt_observation.ignore_observation()
@@ -52,21 +89,11 @@ class HrsObservationProperties(ObservationProperties):
     def instrument_setup(self, observation_id: int) -> types.InstrumentSetup:
         hrs_mode = self._mode()
 
-        sql = """
-        WITH hm (id) AS (
-            SELECT hrs_mode_id FROM observations.hrs_mode
-                   WHERE hrs_mode.hrs_mode=%(hrs_mode)s
-        )
-        INSERT INTO observations.hrs_setup (instrument_setup_id, hrs_mode_id)
-        VALUES (%(instrument_setup_id)s, (SELECT id FROM hm))
-        """
-        parameters = dict(hrs_mode=hrs_mode.value)
-        queries = [types.SQLQuery(sql=sql, parameters=parameters)]
-
-        detmode_header_value = self.header_value("DETMODE")
-        detector_mode = types.DetectorMode.for_name(
-            detmode_header_value if detmode_header_value else ""
-        )
+        queries = [
+            types.SQLQuery(sql=_HRS_SETUP_SQL, parameters={"hrs_mode": hrs_mode.value})
+        ]
+
+        detector_mode = types.DetectorMode.for_name(self._detmode)
 
         return types.InstrumentSetup(
             additional_queries=queries,
@@ -114,16 +141,12 @@ class HrsObservationProperties(ObservationProperties):
         return self.salt_observation.target(observation_id=observation_id)
 
     def _mode(self) -> types.HRSMode:
-        obsmode_header_value = self.header_value("OBSMODE")
-        hrs_mode = obsmode_header_value.upper() if obsmode_header_value else ""
-        if hrs_mode == "LOW RESOLUTION":
-            return types.HRSMode.LOW_RESOLUTION
-        if hrs_mode == "MEDIUM RESOLUTION":
-            return types.HRSMode.MEDIUM_RESOLUTION
-        if hrs_mode == "HIGH RESOLUTION":
-            return types.HRSMode.HIGH_RESOLUTION
-        if hrs_mode == "HIGH STABILITY":
-            return types.HRSMode.HIGH_STABILITY
-        if hrs_mode == "INT CAL FIBRE":
-            return types.HRSMode.INT_CAL_FIBRE
-        raise ValueError(f"Unknown HRS mode {hrs_mode} for file {self.file_path}")
+        # The mode is needed for both the energy and the instrument setup
+        if self._hrs_mode is None:
+            hrs_mode = _HRS_MODES.get(self._obsmode)
+            if hrs_mode is None:
+                raise ValueError(
+                    f"Unknown HRS mode {self._obsmode} for file {self.file_path}"
+                )
+            self._hrs_mode = hrs_mode
+        return self._hrs_mode
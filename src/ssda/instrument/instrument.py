@@ -1,13 +0,0 @@
-from enum import Enum
-
-
-class Instrument(Enum):
-    """
-   Enumeration of instruments.
-
-   """
-
-    BCAM = "BCAM"
-    RSS = "RSS"
-    HRS = "HRS"
-    SALTICAM = "Salticam"
@@ -12,6 +12,9 @@ class ObservationProperties(ABC):
 
     """
 
+    # Subclasses may define __slots__, so no instance dictionary is added here.
+    __slots__ = ()
+
     def access_rule(self) -> Optional[types.AccessRule]:
         raise NotImplementedError
 
@@ -1,3 +1,6 @@
+from typing import Callable, Dict
+
+from ssda.database.sdb import SaltDatabaseService
 from ssda.database.services import DatabaseServices
 from ssda.instrument.bcam_observation_properties import BcamObservationProperties
 from ssda.instrument.hrs_observation_properties import HrsObservationProperties
@@ -10,6 +13,18 @@ from ssda.util import types
 from ssda.util.fits import FitsFile
 
 
+# The observation properties classes for the SALT instruments.
+_SALT_OBSERVATION_PROPERTIES: Dict[
+    types.Instrument,
+    Callable[[FitsFile, SaltDatabaseService], ObservationProperties],
+] = {
+    types.Instrument.RSS: RssObservationProperties,
+    types.Instrument.HRS: HrsObservationProperties,
+    types.Instrument.SALTICAM: SalticamObservationProperties,
+    types.Instrument.BCAM: BcamObservationProperties,
+}
+
+
 def observation_properties(
     fits_file: FitsFile, database_services: DatabaseServices
 ) -> ObservationProperties:
@@ -30,22 +45,15 @@ def observation_properties(
 
     """
 
-    if fits_file.telescope() == types.Telescope.SALT:
-        if fits_file.instrument() == types.Instrument.RSS:
-            return RssObservationProperties(fits_file, database_services.sdb)
-
-        if fits_file.instrument() == types.Instrument.HRS:
-            return HrsObservationProperties(fits_file, database_services.sdb)
-
-        if fits_file.instrument() == types.Instrument.SALTICAM:
-            return SalticamObservationProperties(fits_file, database_services.sdb)
-
-        if fits_file.instrument() == types.Instrument.BCAM:
-            return BcamObservationProperties(fits_file, database_services.sdb)
+    telescope = fits_file.telescope()
+    if telescope == types.Telescope.SALT:
+        instrument = fits_file.instrument()
+        if instrument in _SALT_OBSERVATION_PROPERTIES:
+            return _SALT_OBSERVATION_PROPERTIES[instrument](
+                fits_file, database_services.sdb
+            )
 
         raise ValueError(
-            f"Unknown instrument for file {fits_file.file_path()}: { fits_file.instrument()}"
+            f"Unknown instrument for file {fits_file.file_path()}: {instrument}"
         )
-    raise ValueError(
-        f"Unknown telescope for file {fits_file.file_path()}: {fits_file.telescope()}"
-    )
+    raise ValueError(f"Unknown telescope for file {fits_file.file_path()}: {telescope}")
@@ -134,7 +134,20 @@ class DatabaseConfiguration:
         )
 
 
+# Opening a database connection is expensive, so each database is connected to only
+# once, and the connection is used for all the queries. The connections are closed at
+# the end of notify.
+_sdb_connection: Optional[pymysql.connections.Connection] = None
+_ssda_connection: Optional[psycopg2.extensions.connection] = None
+
+
 def sdb_database_connection():
+    global _sdb_connection
+    if _sdb_connection is not None:
+        # pymysql does not reconnect by itself if the connection has been dropped.
+        _sdb_connection.ping(reconnect=True)
+        return _sdb_connection
+
     sdb_db_config = dsnparse.parse_environ("SDB_DSN")
     sdb_db_config = DatabaseConfiguration(
         username=sdb_db_config.user,
@@ -143,16 +156,26 @@ def sdb_database_connection():
         port=3306,
         database=sdb_db_config.database,
     )
-    sdb_connection = pymysql.connect(
+    _sdb_connection = pymysql.connect(
         database=sdb_db_config.database(),
         host=sdb_db_config.host(),
         user=sdb_db_config.username(),
         passwd=sdb_db_config.password()
     )
-    return sdb_connection
+    return _sdb_connection
 
 
 def ssda_database_connection():
+    global _ssda_connection
+    if _ssda_connection is not None and not _ssda_connection.closed:
+        # A failed query aborts the transaction, and all further queries would fail.
+        if (
+            _ssda_connection.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_INERROR
+        ):
+            _ssda_connection.rollback()
+        return _ssda_connection
+
     ssda_db_config = dsnparse.parse_environ("SSDA_DSN")
     ssda_db_config = DatabaseConfiguration(
         username=ssda_db_config.user,
@@ -161,13 +184,24 @@ def ssda_database_connection():
         port=ssda_db_config.port,
         database=ssda_db_config.database,
     )
-    ssda_connection = psycopg2.connect(
+    _ssda_connection = psycopg2.connect(
         database=ssda_db_config.database(),
         host=ssda_db_config.host(),
         user=ssda_db_config.username(),
         password=ssda_db_config.password(),
     )
-    return ssda_connection
+    return _ssda_connection
+
+
+def close_database_connections() -> None:
+    global _sdb_connection, _ssda_connection
+    if _sdb_connection is not None:
+        if _sdb_connection.open:
+            _sdb_connection.close()
+        _sdb_connection = None
+    if _ssda_connection is not None:
+        _ssda_connection.close()
+        _ssda_connection = None
 
 
 # getting the release dates for the proposals in ssda
@@ -572,8 +606,11 @@ def handle_tac_member(tac_member: TACMember, proposals: Set[Proposal]) -> None:
 
 
 def notify(days):
-    p = astronomers_details(days)
-    for pi_information in p:
-       handle_pi(pi_information)
-    handle_tacs(days)
+    try:
+        p = astronomers_details(days)
+        for pi_information in p:
+            handle_pi(pi_information)
+        handle_tacs(days)
+    finally:
+        close_database_connections()
     return None
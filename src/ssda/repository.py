@@ -87,11 +87,10 @@ def insert(
                     proposal_id
                 )
 
-                for proposal_investigator in proposal_investigators:
-                    # insert proposal investigators
-                    ssda_database_service.insert_proposal_investigator(
-                        proposal_investigator
-                    )
+                # insert proposal investigators
+                ssda_database_service.insert_proposal_investigators(
+                    proposal_investigators
+                )
 
                 # insert proposal access rule
                 ssda_database_service.insert_proposal_access_rule(
@@ -138,10 +137,9 @@ def insert(
         instrument_keyword_values = observation_properties.instrument_keyword_values(
             observation_id
         )
-        for instrument_keyword_value in instrument_keyword_values:
-            ssda_database_service.insert_instrument_keyword_value(
-                instrument_keyword_value
-            )
+        ssda_database_service.insert_instrument_keyword_values(
+            instrument_keyword_values
+        )
 
         # insert instrument setup
         instrument_setup = observation_properties.instrument_setup(observation_id)
@@ -151,10 +149,13 @@ def insert(
 
         # insert instrument-specific content
         for query in instrument_setup.additional_queries:
-            sql = query.sql
-            parameters = {key: value for key, value in query.parameters.items()}
-            parameters["instrument_setup_id"] = instrument_setup_id
-            ssda_database_service.insert_instrument_specific_content(sql, parameters)
+            parameters = {
+                **query.parameters,
+                "instrument_setup_id": instrument_setup_id,
+            }
+            ssda_database_service.insert_instrument_specific_content(
+                query.sql, parameters
+            )
 
         # insert plane
         plane = observation_properties.plane(observation_id)
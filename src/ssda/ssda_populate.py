@@ -1,6 +1,7 @@
 import logging
 import os
 import traceback
+from concurrent.futures import Future
 from datetime import date, datetime, timedelta
 from typing import Callable, List, Optional, Set, Tuple
 
@@ -12,7 +13,12 @@ from ssda.database.sdb import SaltDatabaseService
 from ssda.database.ssda import SSDADatabaseService
 from ssda.util import types
 from ssda.util.errors import get_salt_data_to_log
-from ssda.util.fits import fits_file_paths, set_fits_base_dir, get_night_date
+from ssda.util.fits import (
+    fits_file_paths,
+    get_night_date,
+    prefetched_fits_files,
+    set_fits_base_dir,
+)
 from ssda.util.types import Instrument, DateRange
 from ssda.database.services import DatabaseServices
 from ssda.repository import insert
@@ -36,13 +42,21 @@ if os.environ.get("SENTRY_DSN"):
 def execute_database_insert(
         fits_path: str,
         database_services: DatabaseServices,
+        fits_file_future: Optional[Future] = None,
 ) -> None:
-    # If the FITS file already exists in the database, do nothing.
-    if database_services.ssda.file_exists(fits_path):
-        return
+    if fits_file_future is not None:
+        # The prefetched file is None if it exists in the database already. Any error
+        # from checking this or from opening the file is raised here.
+        fits_file = fits_file_future.result()
+        if fits_file is None:
+            return
+    else:
+        # If the FITS file already exists in the database, do nothing.
+        if database_services.ssda.file_exists(fits_path):
+            return
+        fits_file = StandardFitsFile(fits_path)
 
     # Get the observation properties.
-    fits_file = StandardFitsFile(fits_path)
     try:
         _observation_properties = observation_properties(
             fits_file, database_services
@@ -158,6 +172,7 @@ def populate_ssda(start: Optional[str],
                   fits_base_dir: Optional[str],
                   skip_errors: bool,
                   verbosity: Optional[str],
+                  prefetch_workers: Optional[int] = None,
                   ) -> int:
     logging.basicConfig(level=logging.INFO)
     logging.error("SALT is always assumed to be the telescope.")
@@ -243,16 +258,37 @@ def populate_ssda(start: Optional[str],
     nighttime_errors: List[str] = list()
     warnings: List[str] = list()
     night_date = ""
+    # The inserts for a night are committed together, as committing after every FITS
+    # file is expensive. Each file is inserted in a nested transaction, so that a
+    # failing file does not affect the other files of the night.
+    ssda_database_service.begin_transaction()
     # execute the requested task
-    for path in paths:
+    # The FITS files are opened in background threads, but the database access
+    # happens in this thread only, as the database services and their transactions
+    # must not be shared between threads. Files which exist in the database already
+    # are not opened at all.
+    for path, fits_file_future in prefetched_fits_files(
+        paths, max_workers=prefetch_workers, skip=ssda_database_service.file_exists
+    ):
         try:
-            if verbosity_level >= 1 and night_date != get_night_date(path):
-                night_date = get_night_date(path)
-                click.echo(f"Mapping files for {get_night_date(path)}")
+            # Files whose path contains no night date (such as a file passed with the
+            # --file option) are inserted in the current transaction.
+            try:
+                path_night_date = get_night_date(path)
+            except ValueError:
+                path_night_date = night_date
+            if night_date != path_night_date:
+                if night_date:
+                    ssda_database_service.commit_transaction()
+                    ssda_database_service.begin_transaction()
+                night_date = path_night_date
+                if verbosity_level >= 1:
+                    click.echo(f"Mapping files for {night_date}")
             clear_warnings()
             execute_database_insert(
                 fits_path=path,
                 database_services=database_services,
+                fits_file_future=fits_file_future,
             )
             if get_warnings():
                 handle_exception(
@@ -262,6 +298,7 @@ def populate_ssda(start: Optional[str],
                     warnings=warnings,
                     verbosity_level=verbosity_level,
                     path=path,
+                    fits_file_future=fits_file_future,
                 )
         except BaseException as e:
             handle_exception(
@@ -271,12 +308,25 @@ def populate_ssda(start: Optional[str],
                 warnings=warnings,
                 verbosity_level=verbosity_level,
                 path=path,
+                fits_file_future=fits_file_future,
             )
 
+            # An error outside the nested transaction for the file aborts the
+            # transaction for the whole night, which then has to be started afresh.
+            if ssda_database_service.is_transaction_failed():
+                logging.error(
+                    f"The database transaction failed, so the inserts for the night "
+                    f"{night_date} have been rolled back."
+                )
+                ssda_database_service.rollback_transaction()
+                ssda_database_service.begin_transaction()
+
             if not skip_errors:
+                ssda_database_service.commit_transaction()
                 ssda_connection.close()
                 return -1
 
+    ssda_database_service.commit_transaction()
     ssda_connection.close()
 
     if verbosity_level >= 1:
@@ -343,6 +393,7 @@ def handle_exception(
     warnings: List[str],
     verbosity_level: int,
     path: str,
+    fits_file_future: Optional[Future] = None,
 ):
     """
     Handle an exception.
@@ -361,10 +412,20 @@ def handle_exception(
         Verbosity level.
     path : str
         Path of the FITS File.
+    fits_file_future : Optional[Future]
+        Future for the opened FITS file. The file is opened again if no future is
+        given or if opening the file failed.
 
     """
 
-    data_to_log = get_salt_data_to_log(path)
+    fits_file = (
+        fits_file_future.result()
+        if fits_file_future is not None
+        and fits_file_future.done()
+        and fits_file_future.exception() is None
+        else None
+    )
+    data_to_log = get_salt_data_to_log(path, fits_file)
     error_msg = str(e)
     is_warning = isinstance(e, Warning)
     msg = ""
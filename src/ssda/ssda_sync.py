@@ -6,7 +6,7 @@ from ssda.database.ssda import SSDADatabaseService
 from ssda.util.databases import database_services as db_services
 from ssda.util import types
 from ssda.util.setup_logger import setup_logger
-from typing import Dict, List, Optional
+from typing import cast, Dict, List, Optional, Tuple
 
 
 logging.root.setLevel(logging.INFO)
@@ -337,7 +337,7 @@ class SaltProposalSynchronisation:
             or set(old_proposal.investigators) != set(new_proposal.investigators)
             or (
                 new_proposal.data_release < datetime.now().date()
-                and self._has_existing_position_owner_ids(proposal_id) > 0
+                and self._has_existing_position_owner_ids(proposal_id)
             )
         ):
             owner_ids = self.find_position_owner_ids(
@@ -349,7 +349,7 @@ class SaltProposalSynchronisation:
                  SELECT pln.plane_id
                  FROM observations.plane pln
                  JOIN observations.observation obs ON pln.observation_id = obs.observation_id
-                 WHERE obs.proposal_id='%(proposal_id)s'
+                 WHERE obs.proposal_id=%(proposal_id)s
             )
             UPDATE observations.position SET owner_institution_user_ids=%(owner_ids)s
             WHERE plane_id IN (SELECT * FROM plane_ids)
@@ -376,15 +376,17 @@ class SaltProposalSynchronisation:
 
         """
         sql = """
-        SELECT COUNT(owner_institution_user_ids)
-        FROM observations.position pos
-        JOIN observations.plane pln ON pos.plane_id = pln.plane_id
-        JOIN observations.observation obs ON pln.observation_id = obs.observation_id
-        WHERE obs.proposal_id=%(proposal_id)s AND pos.owner_institution_user_ids IS NOT NULL
+        SELECT EXISTS (
+            SELECT 1
+            FROM observations.position pos
+            JOIN observations.plane pln ON pos.plane_id = pln.plane_id
+            JOIN observations.observation obs ON pln.observation_id = obs.observation_id
+            WHERE obs.proposal_id=%(proposal_id)s AND pos.owner_institution_user_ids IS NOT NULL
+        )
         """
         with self.ssda_database_service.connection().cursor() as cur:
             cur.execute(sql, dict(proposal_id=proposal_id))
-            return int(cur.fetchone()[0]) > 0
+            return bool(cur.fetchone()[0])
 
     def _update_observation_groups(
         self,
@@ -416,48 +418,63 @@ class SaltProposalSynchronisation:
         old_observation_groups = self.ssda_database_service.find_salt_observation_group(
             proposal_code
         )
-        for group_identifier, old_observation_group in old_observation_groups.items():
-            if group_identifier not in new_observation_groups:
-                continue
-            new_observation_group = new_observation_groups[group_identifier]
-            self.update_observation_group(old_observation_group, new_observation_group)
-
-    def update_observation_group(
+        observation_groups = [
+            (old_observation_group, new_observation_groups[group_identifier])
+            for group_identifier, old_observation_group in old_observation_groups.items()
+            if group_identifier in new_observation_groups
+        ]
+        self.update_observation_groups(observation_groups)
+
+    def update_observation_groups(
         self,
-        old_observation_group: types.SALTObservationGroup,
-        new_observation_group: types.SALTObservationGroup,
+        observation_groups: List[
+            Tuple[types.SALTObservationGroup, types.SALTObservationGroup]
+        ],
     ):
         """
-        Update the details of an observation group.
+        Update the details of observation groups.
+
+        The statuses of all the changed observation groups are updated together.
 
         Parameters
         ----------
-        old_observation_group : SALTObservationGroup
-            Old observation group details.
-        new_observation_group : SALTObservationGroup
-            New observation group details.
+        observation_groups : List[Tuple[SALTObservationGroup, SALTObservationGroup]]
+            Pairs of old and new observation group details.
 
         """
 
-        if (
-            old_observation_group.group_identifier is None
-            or old_observation_group.group_identifier
-            != new_observation_group.group_identifier
-        ):
-            raise ValueError(
-                "The old and new observation group must have the same "
-                "group identifier, which must not be None."
-            )
-        group_identifier = old_observation_group.group_identifier
+        changed_observation_groups = []
+        for old_observation_group, new_observation_group in observation_groups:
+            if (
+                old_observation_group.group_identifier is None
+                or old_observation_group.group_identifier
+                != new_observation_group.group_identifier
+            ):
+                raise ValueError(
+                    "The old and new observation group must have the same "
+                    "group identifier, which must not be None."
+                )
 
-        if new_observation_group != old_observation_group:
-            self.ssda_database_service.update_observation_group_status(
-                group_identifier=group_identifier,
-                telescope=types.Telescope.SALT,
-                status=new_observation_group.status,
-            )
+            if new_observation_group != old_observation_group:
+                changed_observation_groups.append(
+                    (old_observation_group, new_observation_group)
+                )
+
+        if not changed_observation_groups:
+            return
+
+        self.ssda_database_service.update_observation_group_statuses(
+            statuses={
+                cast(str, new_observation_group.group_identifier): (
+                    new_observation_group.status
+                )
+                for _, new_observation_group in changed_observation_groups
+            },
+            telescope=types.Telescope.SALT,
+        )
+        for old_observation_group, new_observation_group in changed_observation_groups:
             info_log.info(
-                msg=f"The status of the observation group with group identifier {group_identifier} has been updated from "
+                msg=f"The status of the observation group with group identifier {new_observation_group.group_identifier} has been updated from "
                 f"{old_observation_group.status.value} to {new_observation_group.status.value}."
             )
 
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional
-from ssda.util.fits import StandardFitsFile
+from ssda.util.fits import FitsFile, StandardFitsFile
 
 
 @dataclass
@@ -35,8 +35,10 @@ class LogData:
             return False
 
 
-def get_salt_data_to_log(path: str) -> LogData:
-    fits_file = StandardFitsFile(path)
+def get_salt_data_to_log(path: str, fits_file: Optional[FitsFile] = None) -> LogData:
+    # Avoid reading the file again if it has been opened already
+    if fits_file is None:
+        fits_file = StandardFitsFile(path)
     log_data = LogData(
         path=str(path),
         proposal_code=fits_file.header_value("PROPID"),
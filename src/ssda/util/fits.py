@@ -1,13 +1,27 @@
 from __future__ import annotations
+import glob
+import heapq
 import os
 import random
 import hashlib
 import re
 import string
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, timedelta
-from pathlib import Path
-from typing import Iterator, List, Set, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Optional,
+    Tuple,
+)
 from astropy.units import Quantity
 from astropy.io import fits
 from ssda.util import types
@@ -16,6 +30,18 @@ from ssda.util import types
 # The path of the base directory where all FITS files are stored.
 _fits_base_dir = ""
 
+# The absolute path of the base directory, including a trailing path separator.
+_fits_base_dir_prefix = os.path.join(os.path.abspath(""), "")
+
+# The number of bytes read at a time when calculating a file checksum.
+_CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+# The default number of threads for opening FITS files in advance.
+DEFAULT_PREFETCH_WORKERS = 8
+
+# Pattern for the night date in a FITS file path, such as 2019/0717.
+_NIGHT_DATE = re.compile(r"(\d{4})/(\d{2})(\d{2})")
+
 
 def set_fits_base_dir(path: str) -> None:
     """
@@ -27,8 +53,9 @@ def set_fits_base_dir(path: str) -> None:
         Path of the base directory.
 
     """
-    global _fits_base_dir
+    global _fits_base_dir, _fits_base_dir_prefix
     _fits_base_dir = path
+    _fits_base_dir_prefix = os.path.join(os.path.abspath(path), "")
 
 
 def get_night_date(path: str) -> str:
@@ -48,7 +75,7 @@ def get_night_date(path: str) -> str:
     """
 
     # search for the night date
-    date_search = re.search(r"(\d{4})/(\d{2})(\d{2})", path)
+    date_search = _NIGHT_DATE.search(path)
     if not date_search:
         raise ValueError(f"Invalid date format: {date_search}")
     # format the date as "yyyy-mm-dd"
@@ -71,6 +98,42 @@ def get_fits_base_dir():
     return _fits_base_dir
 
 
+def fits_file_path_relative_to_base_dir(path: str) -> str:
+    """
+    Get the path of a FITS file relative to the base directory.
+
+    Unlike os.path.relpath, this function does not return a path with ".." components
+    for a file outside the base directory, but raises an error. The artifact paths
+    stored in the database are relative to the base directory, so such a file cannot
+    be stored anyway. Callers must handle the error for the individual file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the FITS file.
+
+    Returns
+    -------
+    str
+        The path relative to the base directory.
+
+    Raises
+    ------
+    ValueError
+        If the file is not in the base directory.
+
+    """
+
+    abs_path = os.path.abspath(path)
+    if not abs_path.startswith(_fits_base_dir_prefix):
+        raise ValueError(
+            f"The FITS file {path} is not in the base directory {_fits_base_dir}."
+        )
+
+    prefix_length = len(_fits_base_dir_prefix)
+    return abs_path[prefix_length:]
+
+
 class FitsFile(ABC):
     """
     A FITS file interface.
@@ -209,20 +272,131 @@ def fits_file_paths(
 
     night = nights.start
     while night < nights.end:
-        paths: List[Path] = []
-        for instrument in instruments:
-            paths.extend(
-                Path(fits_file_dir(night, instrument, base_dir)).glob("*.fits")
-            )
-        # Different instruments, such as Salticam and BCAM, may have the same file
-        # paths, hence we use set() to eliminate duplicate values.
-        for path in sorted(set(paths)):
-            if "tmp" in path.name:
-                continue
-            yield str(path)
+        # Different instruments, such as Salticam and BCAM, may share the same
+        # directory, hence we use set() to avoid scanning a directory more than once.
+        directories = set(
+            fits_file_dir(night, instrument, base_dir) for instrument in instruments
+        )
+        # Each directory is sorted on its own, and the results are merged lazily.
+        yield from heapq.merge(
+            *(_sorted_fits_file_paths(directory) for directory in directories)
+        )
         night += timedelta(days=1)
 
 
+def _sorted_fits_file_paths(directory: str) -> List[str]:
+    """
+    The sorted paths of the FITS files in a directory.
+
+    Temporary files (i.e. files whose name contains "tmp") are ignored.
+
+    Parameters
+    ----------
+    directory : str
+        Directory.
+
+    Returns
+    -------
+    List[str]
+        The sorted file paths.
+
+    """
+
+    return sorted(
+        path
+        for path in glob.iglob(os.path.join(directory, "*.fits"))
+        if "tmp" not in os.path.basename(path)
+    )
+
+
+def prefetched_fits_files(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    skip: Optional[Callable[[str], bool]] = None,
+) -> Iterator[Tuple[str, Future]]:
+    """
+    Open FITS files in background threads ahead of their use.
+
+    Reading the FITS headers and calculating the checksum are I/O bound, so they can
+    be done for the next files while the current file is processed. The paths are
+    returned in their original order, together with a future for the corresponding
+    StandardFitsFile instance. Calling the future's result method raises any exception
+    raised when opening the file.
+
+    Files for which the optional skip function returns True are not opened, and the
+    result of their future is None. The skip function is called in the calling thread.
+    If it raises an exception, that exception is raised by the future's result method,
+    so that it can be handled together with the other errors for the file.
+
+    At most twice as many files as there are worker threads are opened in advance.
+    Reading the headers and calculating the checksums is limited by the throughput of
+    the (possibly networked) file system rather than by the number of CPUs, so by
+    default a fixed number of worker threads is used.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        FITS file paths.
+    max_workers : Optional[int]
+        Maximum number of threads to use for opening files. The value of
+        DEFAULT_PREFETCH_WORKERS is used if no value is given.
+    skip : Optional[Callable[[str], bool]]
+        Function returning whether the file with a given path should not be opened.
+
+    Returns
+    -------
+    An iterator with the file paths and futures for the opened files.
+
+    """
+
+    if max_workers is None:
+        max_workers = DEFAULT_PREFETCH_WORKERS
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Tuple[str, Future]] = deque()
+        for path in paths:
+            try:
+                skipped = skip is not None and skip(path)
+            except Exception as e:
+                future: Future = Future()
+                future.set_exception(e)
+            else:
+                if skipped:
+                    future = Future()
+                    future.set_result(None)
+                else:
+                    future = executor.submit(_open_fits_file, path)
+            pending.append((path, future))
+            if len(pending) > 2 * max_workers:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def _open_fits_file(path: str) -> StandardFitsFile:
+    """
+    Open a FITS file and calculate its checksum.
+
+    Parameters
+    ----------
+    path : str
+        FITS file path.
+
+    Returns
+    -------
+    StandardFitsFile
+        The FITS file.
+
+    """
+
+    fits_file = StandardFitsFile(path)
+
+    # The checksum is cached by the FITS file.
+    fits_file.checksum()
+
+    return fits_file
+
+
 def fits_file_dir(night: date, instrument: types.Instrument, base_dir: str) -> str:
     """
     The directory containing the FITS file for a night and instrument.
@@ -263,14 +437,29 @@ def fits_file_dir(night: date, instrument: types.Instrument, base_dir: str) -> s
 
 class StandardFitsFile(FitsFile):
     def __init__(self, path: str) -> None:
-        hdulist = fits.open(path)
         self.path = path
-        self.headers = hdulist[0].header
+        # Only the primary header is needed, so neither the data nor the other HDUs
+        # are read, and the file is closed straight away.
+        self.headers = fits.getheader(path)
+
+        # Looking up keywords in a plain dictionary is much faster than in an astropy
+        # header. As for the header, the first card wins if a keyword is repeated.
+        self._header_values: Dict[str, Any] = {}
+        for keyword, value in self.headers.items():
+            self._header_values.setdefault(keyword, value)
+        self._checksum: Optional[str] = None
+        self._instrument: Optional[types.Instrument] = None
 
     def size(self) -> Quantity:
         return os.stat(self.path).st_size * types.byte
 
     def instrument(self) -> types.Instrument:
+        # The instrument is requested many times while a file is processed
+        if self._instrument is None:
+            self._instrument = self._find_instrument()
+        return self._instrument
+
+    def _find_instrument(self) -> types.Instrument:
         header_value = self.header_value("INSTRUME")
         instrument_value = header_value.upper() if header_value else None
         if instrument_value == "RSS":
@@ -318,23 +507,23 @@ class StandardFitsFile(FitsFile):
         return self.path
 
     def checksum(self) -> str:
-        # Open,close, read file and calculate MD5 on its contents
-        with open(self.file_path(), "rb") as f:
-            # read contents of the file
-            data = f.read()
-            # pipe contents of the file through
-            md5_returned = hashlib.md5(data).hexdigest()
-        return md5_returned
+        # Reading the whole file is expensive, so the checksum is calculated only once
+        if self._checksum is None:
+            # The file is read in chunks, so that large files need not be held in
+            # memory as a whole.
+            md5 = hashlib.md5()
+            with open(self.file_path(), "rb") as f:
+                for chunk in iter(lambda: f.read(_CHECKSUM_CHUNK_SIZE), b""):
+                    md5.update(chunk)
+            self._checksum = md5.hexdigest()
+        return self._checksum
 
     def header_value(self, keyword: str) -> Optional[str]:
-        try:
-            header_value = self.headers[keyword]
-            if header_value is None:
-                return None
-            value = str(header_value).strip()
-            return None if value.upper() == "NONE" else value
-        except KeyError:
+        header_value = self._header_values.get(keyword.upper())
+        if header_value is None:
             return None
+        value = str(header_value).strip()
+        return None if value.upper() == "NONE" else value
 
 
 class DummyFitsFile(FitsFile):
@@ -1,9 +1,10 @@
-from typing import Any, Tuple, List, Optional
+import math
+from typing import Any, Dict, Tuple, Optional, Union
 from astropy.units import Quantity
 from astropy import units as u
 import numpy as np
 
-from ssda.data.salt_data_files_reader import wavelengths_and_transmissions, fp_fwhm
+from ssda.data.salt_data_files_reader import filter_curve, fp_fwhm_curve
 from ssda.util import types
 
 
@@ -18,14 +19,53 @@ RSS_OPTICAL_AXIS_ON_CCD = 0.3066 * u.mm
 # The size of a pixel on the RSS CCD chips
 RSS_PIXEL_SIZE = 0.015 * u.mm
 
+# The same constants as plain floats, for calculations without quantities
+_RSS_OPTICAL_AXIS_ON_CCD_PIXELS = (RSS_OPTICAL_AXIS_ON_CCD / RSS_PIXEL_SIZE).to_value(
+    u.dimensionless_unscaled
+)
+_RSS_PIXEL_SIZE_MM = RSS_PIXEL_SIZE.to_value(u.mm)
+_FOCAL_LENGTH_RSS_IMAGING_LENS_MM = FOCAL_LENGTH_RSS_IMAGING_LENS.to_value(u.mm)
+
 # the focal length of the telescope
 FOCAL_LENGTH_TELESCOPE = 46200 * u.mm
 
 # the focal length of the RSS collimator
 FOCAL_LENGTH_RSS_COLLIMATOR = 630 * u.mm
 
-
-def wavelength_interval_first_boundary(curve: List[Tuple[Quantity, float]]) -> Quantity:
+# The HRS resolving powers for the arms and modes
+_HRS_RESOLVING_POWERS: Dict[Tuple[types.HRSArm, types.HRSMode], Optional[float]] = {
+    (types.HRSArm.BLUE, types.HRSMode.LOW_RESOLUTION): 15000,
+    (types.HRSArm.BLUE, types.HRSMode.MEDIUM_RESOLUTION): 43400,
+    (types.HRSArm.BLUE, types.HRSMode.HIGH_RESOLUTION): 66700,
+    (types.HRSArm.BLUE, types.HRSMode.HIGH_STABILITY): 66900,
+    (types.HRSArm.BLUE, types.HRSMode.INT_CAL_FIBRE): None,
+    (types.HRSArm.RED, types.HRSMode.LOW_RESOLUTION): 14000,
+    (types.HRSArm.RED, types.HRSMode.MEDIUM_RESOLUTION): 39600,
+    (types.HRSArm.RED, types.HRSMode.HIGH_RESOLUTION): 73700,
+    (types.HRSArm.RED, types.HRSMode.HIGH_STABILITY): 64600,
+    (types.HRSArm.RED, types.HRSMode.INT_CAL_FIBRE): None,
+}
+
+# The HRS wavelength intervals for the arms
+_HRS_WAVELENGTH_INTERVALS: Dict[types.HRSArm, Tuple[Quantity, Quantity]] = {
+    types.HRSArm.BLUE: (370 * u.nm, 555 * u.nm),
+    types.HRSArm.RED: (555 * u.nm, 890 * u.nm),
+}
+
+# The RSS grating frequencies (in grooves/mm), keyed by the lower case grating name
+_GRATING_FREQUENCIES: Dict[str, float] = {
+    "pg0300": 300,
+    "pg0900": 903.89,
+    "pg1300": 1299.6,
+    "pg1800": 1801.89,
+    "pg2300": 2302.60,
+    "pg3000": 3000.55,
+}
+
+
+def wavelength_interval_first_boundary(
+    wavelengths: Quantity, values: np.ndarray
+) -> Optional[Quantity]:
     """
     Get the first wavelength for which the given curve has half its maximum's value, or the smallest curve wavelength if
     the curve value exceeds half the maximum at that wavelength.
@@ -35,31 +75,34 @@ def wavelength_interval_first_boundary(curve: List[Tuple[Quantity, float]]) -> Q
     the value lambda for which f(lambda) = y_max / 2 and f(l) < y_max / 2 for all l < lambda.
     If f(lambda1) >= y_max / 2, lambda1 is returned instead.
 
+    The points of the curve are considered in the order in which they are given, so
+    passing the arrays in reverse order yields the last boundary.
+
     Parameters
     ----------
-    curve: List
-        A two-dimensional array defining a curve
+    wavelengths: Quantity
+        An array with the wavelengths of the curve points.
+    values: np.ndarray
+        An array with the curve values for the wavelengths.
 
     Returns
     -------
     Quantity
         The first boundary
     """
-    half_y_max = max(p[1] for p in curve) / 2
-    first_boundary = None
-    for i, t in enumerate(curve):
-        # Move through the points, starting from minimum x, until we've just passed half the maximum y value.
-        if t[1] > half_y_max:
-            if i == 0:
-                first_boundary = t[0]
-                break
-            # Calculate the line y = m * x + c passing through the point before and after the half maximum.
-            # Use this line to get an estimate of the x where y=half_y_max.
-            m = (curve[i][1] - curve[i - 1][1]) / (curve[i][0] - curve[i - 1][0])
-            c = curve[i][1] - m * curve[i][0]
-            first_boundary = (half_y_max - c) / m
-            break
-    return first_boundary
+    half_y_max = values.max() / 2
+    # Find the first point above half the maximum y value.
+    above_half_y_max = values > half_y_max
+    if not above_half_y_max.any():
+        return None
+    i = int(above_half_y_max.argmax())
+    if i == 0:
+        return wavelengths[0]
+    # Calculate the line y = m * x + c passing through the point before and after the half maximum.
+    # Use this line to get an estimate of the x where y=half_y_max.
+    m = (values[i] - values[i - 1]) / (wavelengths[i] - wavelengths[i - 1])
+    c = values[i] - m * wavelengths[i]
+    return (half_y_max - c) / m
 
 
 def filter_wavelength_interval(
@@ -84,18 +127,23 @@ def filter_wavelength_interval(
     Tuple
         The wavelength interval.
     """
-    wavelength_transmission_pairs = wavelengths_and_transmissions(
+    wavelengths, transmissions = filter_curve(
         instrument=instrument, filter_name=filter_name
     )
 
-    sorted_wavelengths = sorted(
-        wavelength_transmission_pairs, key=lambda element: element[0]
-    )
-    reversed_sorted_wavelengths = sorted_wavelengths[::-1]
+    # The curve is sorted and searched with array operations, which avoids unit
+    # arithmetic for every curve point.
+    order = np.argsort(wavelengths.value, kind="stable")
+    sorted_wavelengths = wavelengths[order]
+    sorted_transmissions = transmissions[order]
 
-    lambda_min = wavelength_interval_first_boundary(sorted_wavelengths)
+    lambda_min = wavelength_interval_first_boundary(
+        sorted_wavelengths, sorted_transmissions
+    )
     # This is the last boundary
-    lambda_max = wavelength_interval_first_boundary(reversed_sorted_wavelengths)
+    lambda_max = wavelength_interval_first_boundary(
+        sorted_wavelengths[::-1], sorted_transmissions[::-1]
+    )
 
     return lambda_min, lambda_max
 
@@ -124,32 +172,33 @@ def fabry_perot_fwhm(
     if not rss_fp_mode:
         return None
 
-    fwhm = None
-    fp_fwhm_intervals = fp_fwhm(rss_fp_mode=rss_fp_mode)
+    # The wavelengths are sorted already.
+    wavelengths, fwhms = fp_fwhm_curve(rss_fp_mode=rss_fp_mode)
+    if not len(wavelengths):
+        raise ValueError(f"No FWHM data for the Fabry-Perot mode {rss_fp_mode.value}")
 
-    if (
-        wavelength < min(fp_fwhm_intervals, key=lambda item: item[0])[0]
-        or wavelength > max(fp_fwhm_intervals, key=lambda item: item[0])[0]
-    ):
+    if wavelength < wavelengths[0] or wavelength > wavelengths[-1]:
         return None
-    sorted_points = sorted(fp_fwhm_intervals, key=lambda element: element[0])
-    for i, w in enumerate(sorted_points):
-        #  sorted_points defines a function f of the FWHM as a function of the wavelength.
-        #  We use linear interpolation to estimate the value of f at the given wavelength.
-        if w[0] > wavelength:
-            m = (sorted_points[i][1] - sorted_points[i - 1][1]) / (
-                sorted_points[i][0] - sorted_points[i - 1][0]
-            )
-            c = sorted_points[i][1] - m * sorted_points[i][0]
-            fwhm = wavelength * m + c
-            break
-    if fwhm is None:
+
+    # Find the first wavelength greater than the given one.
+    i = int(
+        np.searchsorted(
+            wavelengths.value, wavelength.to_value(wavelengths.unit), side="right"
+        )
+    )
+    if i == len(wavelengths):
         raise ValueError("Full width half maximum could not be calculated")
-    return fwhm
+
+    #  The wavelengths and FWHMs define a function f of the FWHM as a function of
+    #  the wavelength. We use linear interpolation to estimate the value of f at the
+    #  given wavelength.
+    m = (fwhms[i] - fwhms[i - 1]) / (wavelengths[i] - wavelengths[i - 1])
+    c = fwhms[i] - m * wavelengths[i]
+    return wavelength * m + c
 
 
 def rss_ccd_wavelength(
-    x: float,
+    x: Union[float, np.ndarray],
     grating_angle: Quantity,
     camera_angle: Quantity,
     grating_frequency: Quantity,
@@ -158,10 +207,13 @@ def rss_ccd_wavelength(
     Returns the wavelength at the specified distance
     from the center of the middle CCD.
 
+    An array of distances may be passed, in which case an array of wavelengths is
+    returned. The angle-dependent terms are then calculated only once.
+
     for the constants.
     Parameters
     ----------
-    x: float
+    x: Union[float, np.ndarray]
         Distance (in spectral direction from center (in pixels)
     grating_angle: Quantity
         The grating angle
@@ -175,31 +227,39 @@ def rss_ccd_wavelength(
     wavelength: metres
         The wavelength
     """
+    # The calculation is done with plain floats (angles in radians, lengths in
+    # millimetres), as it is much faster than doing it with quantities.
+
     # What is the outgoing angle beta0 for the center of the middle chip? (Normally, the camera angle will be twice the
     # grating angle, so that the incoming angle (i.e. the grating angle) alpha is equal to beta0.
-    alpha0 = 0 * u.deg  # grating rotation home error.
-    beta_ae = -0.063 * u.deg  # alignment error of the articulation home
+    alpha0 = 0.0  # grating rotation home error.
+    beta_ae = math.radians(-0.063)  # alignment error of the articulation home
     f_a = (
         -4.2e-5
     )  # correction factor allowing for the mechanical error in placement of the articulation detent ring
-    Lambda = 1 / grating_frequency  # grating period
-    alpha = grating_angle + alpha0
-    beta0 = (1 + f_a) * camera_angle + beta_ae - (grating_angle + alpha0)
+    Lambda = 1 / grating_frequency.to_value(1 / u.mm)  # grating period
+    grating_angle_value = grating_angle.to_value(u.rad)
+    alpha = grating_angle_value + alpha0
+    beta0 = (
+        (1 + f_a) * camera_angle.to_value(u.rad)
+        + beta_ae
+        - (grating_angle_value + alpha0)
+    )
 
     # The relevant distance for the optics is that from the optical axis rather than that from the CCD center.
-    x -= RSS_OPTICAL_AXIS_ON_CCD / RSS_PIXEL_SIZE
+    x = x - _RSS_OPTICAL_AXIS_ON_CCD_PIXELS
 
     # "FUDGE FACTOR"
-    x += 20.9
+    x = x + 20.9
 
     # The outgoing angle for a distance x is slightly different the correction dbeta is given by
     # tan(dbeta) = x / f_cam with the focal length f_cam of the imaging lens. Note that x must be converted from pixels
     # to a length.
-    dbeta = np.arctan((x * RSS_PIXEL_SIZE) / FOCAL_LENGTH_RSS_IMAGING_LENS)
+    dbeta = np.arctan((x * _RSS_PIXEL_SIZE_MM) / _FOCAL_LENGTH_RSS_IMAGING_LENS_MM)
     beta = beta0 + dbeta
 
     # The wavelength can now be obtained from the grating equation.
-    return Lambda * (np.sin(alpha) + np.sin(beta))
+    return Lambda * (math.sin(alpha) + np.sin(beta)) * u.mm
 
 
 def rss_resolution_element(
@@ -305,18 +365,10 @@ def get_grating_frequency(grating: str) -> Quantity:
     ------
     The grating frequency (in grooves/mm)
     """
-    grating_table = {
-        "pg0300": 300,
-        "pg0900": 903.89,
-        "pg1300": 1299.6,
-        "pg1800": 1801.89,
-        "pg2300": 2302.60,
-        "pg3000": 3000.55,
-    }
-    if not grating or grating.lower() not in grating_table:
+    if not grating or grating.lower() not in _GRATING_FREQUENCIES:
         raise ValueError("Grating frequency not found on grating table")
 
-    return grating_table[grating.lower()] / u.mm
+    return _GRATING_FREQUENCIES[grating.lower()] / u.mm
 
 
 def hrs_resolving_power(arm: types.HRSArm, hrs_mode: types.HRSMode) -> Optional[float]:
@@ -336,29 +388,8 @@ def hrs_resolving_power(arm: types.HRSArm, hrs_mode: types.HRSMode) -> Optional[
         HRS resolving power
    """
 
-    if types.HRSArm.BLUE == arm:
-        if hrs_mode == types.HRSMode.LOW_RESOLUTION:
-            return 15000
-        if hrs_mode == types.HRSMode.MEDIUM_RESOLUTION:
-            return 43400
-        if hrs_mode == types.HRSMode.HIGH_RESOLUTION:
-            return 66700
-        if hrs_mode == types.HRSMode.HIGH_STABILITY:
-            return 66900
-        if hrs_mode == types.HRSMode.INT_CAL_FIBRE:
-            return None
-
-    if types.HRSArm.RED == arm:
-        if hrs_mode == types.HRSMode.LOW_RESOLUTION:
-            return 14000
-        if hrs_mode == types.HRSMode.MEDIUM_RESOLUTION:
-            return 39600
-        if hrs_mode == types.HRSMode.HIGH_RESOLUTION:
-            return 73700
-        if hrs_mode == types.HRSMode.HIGH_STABILITY:
-            return 64600
-        if hrs_mode == types.HRSMode.INT_CAL_FIBRE:
-            return None
+    if (arm, hrs_mode) in _HRS_RESOLVING_POWERS:
+        return _HRS_RESOLVING_POWERS[(arm, hrs_mode)]
 
     raise ValueError(f"Unknown HRS arm {arm.value}")
 
@@ -378,11 +409,8 @@ def hrs_wavelength_interval(arm: types.HRSArm) -> Tuple[Quantity, Quantity]:
         The HRS interval.
     """
 
-    if types.HRSArm.BLUE == arm:
-        return 370 * u.nm, 555 * u.nm
-
-    if types.HRSArm.RED == arm:
-        return 555 * u.nm, 890 * u.nm
+    if arm in _HRS_WAVELENGTH_INTERVALS:
+        return _HRS_WAVELENGTH_INTERVALS[arm]
 
     raise ValueError(f"Unknown HRS arm {arm.value}")
 
@@ -454,18 +482,16 @@ def rss_spectral_properties(header_value: Any, plane_id: int) -> Optional[types.
         slit_barcode = header_value("MASKID")
         spectral_binning = int(header_value("CCDSUM").split()[0])
         grating_frequency = get_grating_frequency(header_value("GRATING"))
-        wavelength_interval = (
-            rss_ccd_wavelength(
-                -3162, grating_angle, camera_angle, grating_frequency=grating_frequency
-            ),
-            rss_ccd_wavelength(
-                3162, grating_angle, camera_angle, grating_frequency=grating_frequency
-            ),
+        # All the required wavelengths are calculated in one go.
+        wavelengths = rss_ccd_wavelength(
+            np.array([-3162, 3162, spectral_binning, 0]),
+            grating_angle,
+            camera_angle,
+            grating_frequency=grating_frequency,
         )
+        wavelength_interval = (wavelengths[0], wavelengths[1])
         dimension = 6096 // spectral_binning
-        sample_size = rss_ccd_wavelength(
-            spectral_binning, grating_angle, camera_angle, grating_frequency
-        ) - rss_ccd_wavelength(0, grating_angle, camera_angle, grating_frequency)
+        sample_size = wavelengths[2] - wavelengths[3]
         return types.Energy(
             dimension=dimension,
             max_wavelength=max(wavelength_interval),
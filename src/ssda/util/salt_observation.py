@@ -1,13 +1,13 @@
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import timedelta, date, datetime
 from astropy.coordinates import Angle
 
 import astropy.units as u
 from ssda.database.sdb import SaltDatabaseService, FileDataItem
-from ssda.util.fits import FitsFile, get_fits_base_dir
+from ssda.util.fits import FitsFile, fits_file_path_relative_to_base_dir
 
 from ssda.util import types
 from ssda.util.salt_fits import parse_start_datetime
@@ -20,19 +20,58 @@ class FileData:
     data: Dict[str, FileDataItem]
     night: Optional[date]
 
+
+# Proposal ids of arc and flat calibrations
+_ARC_PROPOSAL_IDS = frozenset({"CAL_ARC", "CAL_STABLE"})
+_FLAT_PROPOSAL_IDS = frozenset({"CAL_FLAT", "CAL_SKYFLAT"})
+
+# Proposal ids of observations which are not stored
+_IGNORED_PROPOSAL_IDS = frozenset(
+    {"JUNK", "UNKNOWN", "NONE", "ENG", "CAL_GAIN", "TEST"}
+)
+
+# Product categories of calibrations
+_CALIBRATION_PRODUCT_CATEGORIES = frozenset(
+    {
+        types.ProductCategory.ARC,
+        types.ProductCategory.BIAS,
+        types.ProductCategory.DARK,
+        types.ProductCategory.FLAT,
+        types.ProductCategory.STANDARD,
+    }
+)
+
+# The modification time and the names of the FITS files of the most recently scanned
+# product directory.
+_product_file_names: Dict[Path, Tuple[Optional[int], List[str]]] = {}
+
+
 # Creates a file path of the reduced calibration level mapping a raw calibration level.
 def create_reduced_path(raw_path: Path) -> Optional[Path]:
     reduced_dir = Path.joinpath(raw_path.parent.parent, "product")
 
-    reduced_paths = reduced_dir.glob("*.fits")
+    # Consecutive files usually share the same product directory, so it is only
+    # scanned again when a file from a different directory is encountered or when
+    # files have been added to (or removed from) the directory since the last scan.
+    try:
+        modification_time: Optional[int] = reduced_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        modification_time = None
+    scanned = _product_file_names.get(reduced_dir)
+    if scanned is None or scanned[0] != modification_time:
+        _product_file_names.clear()
+        _product_file_names[reduced_dir] = (
+            modification_time,
+            [_path.name for _path in reduced_dir.glob("*.fits")],
+        )
 
-    reduced_path: Optional[Path] = None
+    reduced_name: Optional[str] = None
 
-    for _path in reduced_paths:
-        if _path.name.endswith(raw_path.name):
-            if reduced_path is None or len(_path.name) > len(reduced_path.name):
-                reduced_path = _path
-    return reduced_path
+    for name in _product_file_names[reduced_dir][1]:
+        if name.endswith(raw_path.name):
+            if reduced_name is None or len(name) > len(reduced_name):
+                reduced_name = name
+    return None if reduced_name is None else Path.joinpath(reduced_dir, reduced_name)
 
 
 class SALTObservation:
@@ -45,6 +84,16 @@ class SALTObservation:
         self.fits_file = fits_file
         self.file_path = fits_file.file_path
         self.database_service = database_service
+        # The (uppercase) proposal id from the FITS header is used by several methods.
+        propid_header_value = self.header_value("PROPID")
+        self._propid = propid_header_value.upper() if propid_header_value else ""
+        self._paths: Optional[types.CalibrationLevelPaths] = None
+        self._block_visit_id_value: Optional[str] = None
+        self._product_category_value: Optional[types.ProductCategory] = None
+        self._proposal_code_value: Optional[str] = None
+        self._release_dates_and_status: Optional[
+            Tuple[Tuple[date, date], types.Status]
+        ] = None
 
     def access_rule(self) -> Optional[types.AccessRule]:
         proposal_code = self._proposal_code()
@@ -62,28 +111,43 @@ class SALTObservation:
 
     def artifact(self, plane_id: int) -> types.Artifact:
         raw_path = self.fits_file.file_path()
-        reduced_path = create_reduced_path(Path(raw_path))
 
         identifier = uuid.uuid4()
 
         return types.Artifact(
             content_checksum=self.fits_file.checksum(),
-            content_length=self.fits_file.size(),
+            content_length=self.size,
             identifier=identifier,
             name=Path(raw_path).name,
             plane_id=plane_id,
-            paths=types.CalibrationLevelPaths(
-                raw=Path(raw_path).relative_to(get_fits_base_dir()),
-                reduced=None
-                if not reduced_path
-                else Path(reduced_path).relative_to(get_fits_base_dir()),
-            ),
+            paths=self._calibration_level_paths(),
             product_type=self._product_type(),
         )
 
+    def _calibration_level_paths(self) -> types.CalibrationLevelPaths:
+        # The artifact is requested more than once per file, and finding the reduced
+        # file requires a directory scan. So the paths are only computed once.
+        if self._paths is None:
+            raw_path = Path(self.fits_file.file_path())
+            reduced_path = create_reduced_path(raw_path)
+            self._paths = types.CalibrationLevelPaths(
+                raw=Path(fits_file_path_relative_to_base_dir(str(raw_path))),
+                reduced=None
+                if not reduced_path
+                else Path(fits_file_path_relative_to_base_dir(str(reduced_path))),
+            )
+
+        return self._paths
+
     def _proposal_code(self) -> str:
-        propid_header_value = self.header_value("PROPID")
-        propid = propid_header_value.upper() if propid_header_value else ""
+        # The proposal code is needed by most of the other methods, so it is only
+        # determined once.
+        if self._proposal_code_value is None:
+            self._proposal_code_value = self._find_proposal_code()
+        return self._proposal_code_value
+
+    def _find_proposal_code(self) -> str:
+        propid = self._propid
 
         # Some FITS files have proposal codes which have been renamed in the database.
         existing = self.database_service.is_existing_proposal_code(propid)
@@ -96,6 +160,13 @@ class SALTObservation:
             return ""
 
     def _block_visit_id(self) -> Optional[str]:
+        # The block visit id is needed by many of the other methods, so it is only
+        # determined once.
+        if self._block_visit_id_value is None:
+            self._block_visit_id_value = self._find_block_visit_id()
+        return self._block_visit_id_value
+
+    def _find_block_visit_id(self) -> str:
         # The block visit id from the FITS header...
         bvid_from_fits: Optional[str] = self.fits_file.header_value("BVISITID")
 
@@ -152,15 +223,7 @@ class SALTObservation:
         proposal_id: Optional[int],
         instrument: types.Instrument,
     ) -> types.Observation:
-        proposal_code = self._proposal_code()
-        if proposal_code:
-            data_release_dates = self.database_service.find_release_date(proposal_code)
-        else:
-            data_release_dates = (
-                self.observation_start_time().date(),
-                self.observation_start_time().date(),
-            )
-        status = self.database_service.find_observation_status(self._block_visit_id())
+        data_release_dates, status = self._observation_release_dates_and_status()
         return types.Observation(
             data_release=data_release_dates[0],
             instrument=instrument,
@@ -172,6 +235,29 @@ class SALTObservation:
             telescope=types.Telescope.SALT,
         )
 
+    def _observation_release_dates_and_status(
+        self,
+    ) -> Tuple[Tuple[date, date], types.Status]:
+        # The observation is requested more than once per file, but the release dates
+        # and status require database queries. So they are only determined once.
+        if self._release_dates_and_status is None:
+            proposal_code = self._proposal_code()
+            if proposal_code:
+                data_release_dates = self.database_service.find_release_date(
+                    proposal_code
+                )
+            else:
+                data_release_dates = (
+                    self.observation_start_time().date(),
+                    self.observation_start_time().date(),
+                )
+            status = self.database_service.find_observation_status(
+                self._block_visit_id()
+            )
+            self._release_dates_and_status = (data_release_dates, status)
+
+        return self._release_dates_and_status
+
     def observation_group(self) -> Optional[types.ObservationGroup]:
         bv_id = self._block_visit_id()
         if bv_id is None:
@@ -302,19 +388,24 @@ class SALTObservation:
 
         return obs_type
 
-    def _product_category(self):
+    def _product_category(self) -> types.ProductCategory:
+        # The product category is needed for the intent, product type and various
+        # checks, so it is only determined once.
+        if self._product_category_value is None:
+            self._product_category_value = self._find_product_category()
+        return self._product_category_value
+
+    def _find_product_category(self) -> types.ProductCategory:
         observation_object = (
             self.header_value("OBJECT").upper() if self.header_value("OBJECT") else ""
         )
         obs_type = self._obs_type()
-        proposal_id = (
-            self.header_value("PROPID").upper() if self.header_value("PROPID") else ""
-        )
+        proposal_id = self._propid
 
         obs_type_unknown = not obs_type or obs_type == "ZERO"
 
         if (
-            proposal_id in ["CAL_ARC", "CAL_STABLE"]
+            proposal_id in _ARC_PROPOSAL_IDS
             or "ARC" in obs_type
             or (
                 obs_type_unknown
@@ -332,7 +423,7 @@ class SALTObservation:
         ):
             return types.ProductCategory.BIAS
         if (
-            proposal_id in ["CAL_FLAT", "CAL_SKYFLAT"]
+            proposal_id in _FLAT_PROPOSAL_IDS
             or "FLAT" in obs_type
             or (
                 obs_type_unknown
@@ -381,8 +472,7 @@ class SALTObservation:
         obs_mode = obsmode_header_value.upper() if obsmode_header_value else ""
         instrume_header_value = self.header_value("INSTRUME")
         instrument = instrume_header_value.upper() if instrume_header_value else ""
-        propid_header_value = self.header_value("PROPID")
-        proposal_id = propid_header_value.upper() if propid_header_value else ""
+        proposal_id = self._propid
         product_category = self._product_category()
 
         if product_category == types.ProductCategory.ARC:
@@ -444,7 +534,7 @@ class SALTObservation:
         header_values = {
             "INSTRUME": instrume_header_value,
             "OBSMODE": obsmode_header_value,
-            "PROPID": propid_header_value,
+            "PROPID": self.header_value("PROPID"),
         }
         raise ValueError(
             f"The product type could not be determined. (Product Category: {product_category}, observation mode: {obs_mode}, instrument: {instrument}, FITS header values: {header_values})"
@@ -463,15 +553,7 @@ class SALTObservation:
         )
 
     def is_calibration(self):
-        product_category = self._product_category()
-
-        return (
-            product_category == types.ProductCategory.ARC
-            or product_category == types.ProductCategory.BIAS
-            or product_category == types.ProductCategory.DARK
-            or product_category == types.ProductCategory.FLAT
-            or product_category == types.ProductCategory.STANDARD
-        )
+        return self._product_category() in _CALIBRATION_PRODUCT_CATEGORIES
 
     def is_standard(self):
         product_category = self._product_category()
@@ -479,10 +561,9 @@ class SALTObservation:
         return product_category == types.ProductCategory.STANDARD
 
     def ignore_observation(self) -> bool:
-        propid_header_value = self.fits_file.header_value("PROPID")
-        proposal_id = propid_header_value.upper() if propid_header_value else ""
+        proposal_id = self._propid
         # If the FITS file is Junk, Unknown, ENG or CAL_GAIN, do not store the observation.
-        if proposal_id in ("JUNK", "UNKNOWN", "NONE", "ENG", "CAL_GAIN", "TEST"):
+        if proposal_id in _IGNORED_PROPOSAL_IDS:
             return True
         # Do not store engineering data.
         # Proposal ids referring to an actual proposal will always start with a "2" (as in 2020-1-SCI-014).
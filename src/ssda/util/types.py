@@ -101,6 +101,16 @@ class Artifact:
 
     """
 
+    __slots__ = (
+        "_content_checksum",
+        "_content_length",
+        "_identifier",
+        "_name",
+        "_paths",
+        "_plane_id",
+        "_product_type",
+    )
+
     def __init__(
         self,
         content_checksum: str,
@@ -401,15 +411,20 @@ class DetectorMode(Enum):
         if name and name.lower() == "ft":
             name = "Frame Transfer"
 
-        for detector_mode in DetectorMode:
-            if (
-                name
-                and name.replace(" ", "").lower()
-                == str(detector_mode.value).replace(" ", "").lower()
-            ):
-                return detector_mode
+        detector_mode = (
+            _DETECTOR_MODES.get(name.replace(" ", "").lower()) if name else None
+        )
+        if detector_mode is None:
+            raise ValueError(f"Unknown detector mode: '{name}'")
+
+        return detector_mode
 
-        raise ValueError(f"Unknown detector mode: '{name}'")
+
+# The detector modes, keyed by their lowercase value without spaces
+_DETECTOR_MODES: Dict[str, DetectorMode] = {
+    str(detector_mode.value).replace(" ", "").lower(): detector_mode
+    for detector_mode in DetectorMode
+}
 
 
 class Energy:
@@ -433,6 +448,15 @@ class Energy:
 
     """
 
+    __slots__ = (
+        "_dimension",
+        "_max_wavelength",
+        "_min_wavelength",
+        "_plane_id",
+        "_resolving_power",
+        "_sample_size",
+    )
+
     def __init__(
         self,
         dimension: int,
@@ -785,11 +809,11 @@ class Instrument(Enum):
 
         """
 
-        for instrument in Instrument:
-            if name.lower() == str(instrument.value).lower():
-                return instrument
+        instrument = _INSTRUMENTS.get(name.lower())
+        if instrument is None:
+            raise ValueError(f"Unknown instrument name: {name}")
 
-        raise ValueError(f"Unknown instrument name: {name}")
+        return instrument
 
     @staticmethod
     def instruments(telescope: Telescope):
@@ -818,6 +842,12 @@ class Instrument(Enum):
         raise ValueError(f"Unknown telescope {telescope}")
 
 
+# The instruments, keyed by their lowercase value
+_INSTRUMENTS: Dict[str, Instrument] = {
+    str(instrument.value).lower(): instrument for instrument in Instrument
+}
+
+
 class InstrumentKeyword(Enum):
     """
     Enumeration of the available instrument keywords.
@@ -846,6 +876,8 @@ class InstrumentKeywordValue:
 
     """
 
+    __slots__ = ("_instrument", "_instrument_keyword", "_observation_id", "_value")
+
     def __init__(
         self,
         instrument: Instrument,
@@ -946,6 +978,14 @@ class InstrumentSetup:
 
     """
 
+    __slots__ = (
+        "_additional_queries",
+        "_detector_mode",
+        "_filter",
+        "_instrument_mode",
+        "_observation_id",
+    )
+
     def __init__(
         self,
         additional_queries: List[SQLQuery],
@@ -1043,6 +1083,17 @@ class Observation:
 
     """
 
+    __slots__ = (
+        "_data_release",
+        "_instrument",
+        "_intent",
+        "_meta_release",
+        "_observation_group_id",
+        "_proposal_id",
+        "_status",
+        "_telescope",
+    )
+
     def __init__(
         self,
         data_release: date,
@@ -1152,6 +1203,14 @@ class ObservationTime:
 
     """
 
+    __slots__ = (
+        "_end_time",
+        "_exposure_time",
+        "_plane_id",
+        "_resolution",
+        "_start_time",
+    )
+
     def __init__(
         self,
         end_time: datetime,
@@ -1219,6 +1278,8 @@ class Plane:
 
     """
 
+    __slots__ = ("_data_product_type", "_observation_id")
+
     def __init__(self, observation_id: int, data_product_type: DataProductType):
         self._observation_id = observation_id
         self._data_product_type = data_product_type
@@ -1282,6 +1343,8 @@ class Polarization:
 
     """
 
+    __slots__ = ("_plane_id", "_polarization_mode")
+
     def __init__(self, plane_id: int, polarization_mode: PolarizationMode):
         self._plane_id = plane_id
         self._polarization_mode = polarization_mode
@@ -1313,6 +1376,8 @@ class Position:
 
     """
 
+    __slots__ = ("_dec", "_equinox", "_plane_id", "_ra")
+
     def __init__(self, dec: Quantity, equinox: float, plane_id: int, ra: Quantity):
         try:
             dec.to(u.degree)
@@ -1468,6 +1533,8 @@ class Proposal:
 
     """
 
+    __slots__ = ("_institution", "_pi", "_proposal_code", "_title", "proposal_type")
+
     def __init__(
         self,
         institution: Institution,
@@ -1524,6 +1591,13 @@ class ProposalInvestigator:
 
     """
 
+    __slots__ = (
+        "_institution",
+        "_institution_memberships",
+        "_investigator_id",
+        "_proposal_id",
+    )
+
     def __init__(
         self,
         proposal_id: int,
@@ -1735,6 +1809,8 @@ class Target:
 
     """
 
+    __slots__ = ("_name", "_observation_id", "_standard", "_target_type")
+
     def __init__(
         self, name: str, observation_id: int, standard: bool, target_type: str
     ):
@@ -229,10 +229,6 @@ def test_all_content_is_inserted(mocker):
     mock_database_service.return_value.find_proposal_id.return_value = None
     mock_database_service.return_value.insert_artifact.return_value = 713
     mock_database_service.return_value.insert_energy.return_value = 92346
-    mock_database_service.return_value.insert_instrument_keyword_value.side_effect = [
-        1409,
-        1410,
-    ]
     mock_database_service.return_value.insert_instrument_setup.return_value = (
         INSTRUMENT_SETUP_ID
     )
@@ -267,18 +263,16 @@ def test_all_content_is_inserted(mocker):
     )
 
     # proposal investigators inserted
-    assert (
-        mock_database_service.return_value.insert_proposal_investigator.call_count == 3
-    )
+    mock_database_service.return_value.insert_proposal_investigators.assert_called_once()
+    proposal_investigators = mock_database_service.return_value.insert_proposal_investigators.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(proposal_investigators) == 3
     for i in range(3):
         assert_equal_properties(
-            mock_database_service.return_value.insert_proposal_investigator.call_args_list[
-                i
-            ][
-                0
-            ][
-                0
-            ],
+            proposal_investigators[i],
             observation_properties.proposal_investigators(PROPOSAL_ID)[i],
         )
 
@@ -304,19 +298,16 @@ def test_all_content_is_inserted(mocker):
     )
 
     # instrument keyword values inserted
-    assert (
-        mock_database_service.return_value.insert_instrument_keyword_value.call_count
-        == 2
-    )
+    mock_database_service.return_value.insert_instrument_keyword_values.assert_called_once()
+    instrument_keyword_values = mock_database_service.return_value.insert_instrument_keyword_values.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(instrument_keyword_values) == 2
     for i in range(2):
         assert_equal_properties(
-            mock_database_service.return_value.insert_instrument_keyword_value.call_args_list[
-                i
-            ][
-                0
-            ][
-                0
-            ],
+            instrument_keyword_values[i],
             observation_properties.instrument_keyword_values(OBSERVATION_ID)[i],
         )
 
@@ -414,10 +405,6 @@ def test_proposals_are_not_reinserted(mocker):
     mock_database_service.return_value.find_proposal_id.return_value = PROPOSAL_ID
     mock_database_service.return_value.insert_artifact.return_value = 713
     mock_database_service.return_value.insert_energy.return_value = 92346
-    mock_database_service.return_value.insert_instrument_keyword_value.side_effect = [
-        1409,
-        1410,
-    ]
     mock_database_service.return_value.insert_instrument_setup.return_value = (
         INSTRUMENT_SETUP_ID
     )
@@ -445,7 +432,7 @@ def test_proposals_are_not_reinserted(mocker):
     mock_database_service.return_value.insert_proposal.assert_not_called()
 
     # proposal investigators not reinserted
-    mock_database_service.return_value.insert_proposal_investigator.assert_not_called()
+    mock_database_service.return_value.insert_proposal_investigators.assert_not_called()
 
     # observation inserted
     mock_database_service.return_value.insert_observation.assert_called_once()
@@ -462,19 +449,16 @@ def test_proposals_are_not_reinserted(mocker):
     )
 
     # instrument keyword values inserted
-    assert (
-        mock_database_service.return_value.insert_instrument_keyword_value.call_count
-        == 2
-    )
+    mock_database_service.return_value.insert_instrument_keyword_values.assert_called_once()
+    instrument_keyword_values = mock_database_service.return_value.insert_instrument_keyword_values.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(instrument_keyword_values) == 2
     for i in range(2):
         assert_equal_properties(
-            mock_database_service.return_value.insert_instrument_keyword_value.call_args_list[
-                i
-            ][
-                0
-            ][
-                0
-            ],
+            instrument_keyword_values[i],
             observation_properties.instrument_keyword_values(OBSERVATION_ID)[i],
         )
 
@@ -572,10 +556,6 @@ def test_observation_groups_are_not_reinserted(mocker):
     mock_database_service.return_value.find_proposal_id.return_value = PROPOSAL_ID
     mock_database_service.return_value.insert_artifact.return_value = 713
     mock_database_service.return_value.insert_energy.return_value = 92346
-    mock_database_service.return_value.insert_instrument_keyword_value.side_effect = [
-        1409,
-        1410,
-    ]
     mock_database_service.return_value.insert_instrument_setup.return_value = (
         INSTRUMENT_SETUP_ID
     )
@@ -604,7 +584,7 @@ def test_observation_groups_are_not_reinserted(mocker):
 
     # proposal investigators not reinserted
     assert (
-        mock_database_service.return_value.insert_proposal_investigator.asserrt_not_called()
+        mock_database_service.return_value.insert_proposal_investigators.asserrt_not_called()
     )
 
     # observation inserted
@@ -622,19 +602,16 @@ def test_observation_groups_are_not_reinserted(mocker):
     )
 
     # instrument keyword values inserted
-    assert (
-        mock_database_service.return_value.insert_instrument_keyword_value.call_count
-        == 2
-    )
+    mock_database_service.return_value.insert_instrument_keyword_values.assert_called_once()
+    instrument_keyword_values = mock_database_service.return_value.insert_instrument_keyword_values.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(instrument_keyword_values) == 2
     for i in range(2):
         assert_equal_properties(
-            mock_database_service.return_value.insert_instrument_keyword_value.call_args_list[
-                i
-            ][
-                0
-            ][
-                0
-            ],
+            instrument_keyword_values[i],
             observation_properties.instrument_keyword_values(OBSERVATION_ID)[i],
         )
 
@@ -729,10 +706,6 @@ def test_observations_are_not_reinserted(mocker):
     mock_database_service.return_value.find_proposal_id.return_value = None
     mock_database_service.return_value.insert_artifact.return_value = 713
     mock_database_service.return_value.insert_energy.return_value = 92346
-    mock_database_service.return_value.insert_instrument_keyword_value.side_effect = [
-        1409,
-        1410,
-    ]
     mock_database_service.return_value.insert_instrument_setup.return_value = (
         INSTRUMENT_SETUP_ID
     )
@@ -764,25 +737,23 @@ def test_observations_are_not_reinserted(mocker):
     )
 
     # proposal investigators inserted
-    assert (
-        mock_database_service.return_value.insert_proposal_investigator.call_count == 3
-    )
+    mock_database_service.return_value.insert_proposal_investigators.assert_called_once()
+    proposal_investigators = mock_database_service.return_value.insert_proposal_investigators.call_args[
+        0
+    ][
+        0
+    ]
+    assert len(proposal_investigators) == 3
     for i in range(3):
         assert_equal_properties(
-            mock_database_service.return_value.insert_proposal_investigator.call_args_list[
-                i
-            ][
-                0
-            ][
-                0
-            ],
+            proposal_investigators[i],
             observation_properties.proposal_investigators(PROPOSAL_ID)[i],
         )
 
     # nothing else is inserted
     mock_database_service.return_value.insert_artifact.assert_not_called()
     mock_database_service.return_value.insert_energy.assert_not_called()
-    mock_database_service.return_value.insert_instrument_keyword_value.assert_not_called()
+    mock_database_service.return_value.insert_instrument_keyword_values.assert_not_called()
     mock_database_service.return_value.insert_observation.assert_not_called()
     mock_database_service.return_value.insert_observation_time.assert_not_called()
     mock_database_service.return_value.insert_plane.assert_not_called()
@@ -800,10 +771,6 @@ def test_transactions_are_rolled_back_if_inserting_fails(mocker):
     mock_database_service.return_value.insert_energy.side_effect = ValueError(
         "This is a fake error."
     )
-    mock_database_service.return_value.insert_instrument_keyword_value.side_effect = [
-        1409,
-        1410,
-    ]
     mock_database_service.return_value.insert_instrument_setup.return_value = (
         INSTRUMENT_SETUP_ID
     )
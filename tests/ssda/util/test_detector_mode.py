@@ -0,0 +1,24 @@
+import pytest
+
+from ssda.util import types
+
+
+def test_detector_mode_for_name_rejects_invalid_name():
+    with pytest.raises(ValueError) as excinfo:
+        types.DetectorMode.for_name("Xghyu")
+    assert "detector mode" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "detector_mode",
+    [
+        ("Normal", types.DetectorMode.NORMAL),
+        ("frame transfer", types.DetectorMode.FRAME_TRANSFER),
+        ("FT", types.DetectorMode.FRAME_TRANSFER),
+        ("DRIFTSCAN", types.DetectorMode.DRIFT_SCAN),
+        ("Slot", types.DetectorMode.SLOT_MODE),
+        ("Slot Mode", types.DetectorMode.SLOT_MODE),
+    ],
+)
+def test_detector_modes_can_be_created_from_name(detector_mode):
+    assert types.DetectorMode.for_name(detector_mode[0]) == detector_mode[1]
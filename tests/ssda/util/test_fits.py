@@ -1,8 +1,12 @@
 import glob
+import hashlib
 import pytest
 from datetime import date
 from typing import Iterator, NamedTuple
 
+import numpy as np
+from astropy.io import fits
+
 import ssda.util.fits
 from ssda.util.types import Instrument, DateRange
 
@@ -92,6 +96,132 @@ def test_fits_file_paths_returns_correct_paths(mocker):
     assert paths == set()
 
 
+def test_fits_file_paths_scans_shared_directories_once(tmp_path):
+    for directory, filename in [
+        ("salt/data/2019/1027/scam/raw", "S201910270002.fits"),
+        ("salt/data/2019/1027/scam/raw", "S201910270001.fits"),
+        ("salt/data/2019/1027/scam/raw", "S201910270003tmp.fits"),
+        ("salt/data/2019/1027/rss/raw", "P201910270001.fits"),
+        ("salt/data/2019/1028/scam/raw", "S201910280001.fits"),
+    ]:
+        (tmp_path / directory).mkdir(parents=True, exist_ok=True)
+        (tmp_path / directory / filename).touch()
+
+    paths = list(
+        ssda.util.fits.fits_file_paths(
+            DateRange(date(2019, 10, 27), date(2019, 10, 29)),
+            {Instrument.BCAM, Instrument.RSS, Instrument.SALTICAM},
+            str(tmp_path),
+        )
+    )
+
+    assert paths == [
+        f"{tmp_path}/salt/data/2019/1027/rss/raw/P201910270001.fits",
+        f"{tmp_path}/salt/data/2019/1027/scam/raw/S201910270001.fits",
+        f"{tmp_path}/salt/data/2019/1027/scam/raw/S201910270002.fits",
+        f"{tmp_path}/salt/data/2019/1028/scam/raw/S201910280001.fits",
+    ]
+
+
+def test_prefetched_fits_files_preserves_order(mocker):
+    standard_fits_file = mocker.patch.object(ssda.util.fits, "StandardFitsFile")
+    standard_fits_file.side_effect = lambda path: mocker.MagicMock(path=path)
+
+    paths = [f"{i}.fits" for i in range(20)]
+    prefetched = list(ssda.util.fits.prefetched_fits_files(paths, max_workers=3))
+
+    assert [path for path, _ in prefetched] == paths
+    assert [future.result().path for _, future in prefetched] == paths
+
+
+def test_prefetched_fits_files_calculates_checksums(mocker):
+    standard_fits_file = mocker.patch.object(ssda.util.fits, "StandardFitsFile")
+    standard_fits_file.side_effect = lambda path: mocker.MagicMock(path=path)
+
+    paths = [f"{i}.fits" for i in range(5)]
+    for _, future in ssda.util.fits.prefetched_fits_files(paths, max_workers=2):
+        future.result().checksum.assert_called_once_with()
+
+
+def test_prefetched_fits_files_does_not_open_skipped_files(mocker):
+    standard_fits_file = mocker.patch.object(ssda.util.fits, "StandardFitsFile")
+    standard_fits_file.side_effect = lambda path: mocker.MagicMock(path=path)
+
+    paths = [f"{i}.fits" for i in range(6)]
+    prefetched = list(
+        ssda.util.fits.prefetched_fits_files(
+            paths, max_workers=2, skip=lambda path: path in ("1.fits", "4.fits")
+        )
+    )
+
+    assert [path for path, _ in prefetched] == paths
+    assert [
+        future.result().path if future.result() else None for _, future in prefetched
+    ] == ["0.fits", None, "2.fits", "3.fits", None, "5.fits"]
+    assert standard_fits_file.call_count == 4
+
+
+def test_prefetched_fits_files_passes_skip_errors_to_future(mocker):
+    standard_fits_file = mocker.patch.object(ssda.util.fits, "StandardFitsFile")
+    standard_fits_file.side_effect = lambda path: mocker.MagicMock(path=path)
+
+    def skip(path: str) -> bool:
+        if path == "1.fits":
+            raise ValueError("Invalid path")
+        return False
+
+    paths = [f"{i}.fits" for i in range(3)]
+    prefetched = list(
+        ssda.util.fits.prefetched_fits_files(paths, max_workers=2, skip=skip)
+    )
+
+    assert [path for path, _ in prefetched] == paths
+    with pytest.raises(ValueError) as excinfo:
+        prefetched[1][1].result()
+    assert "Invalid path" in str(excinfo.value)
+    assert prefetched[2][1].result().path == "2.fits"
+
+
+def test_checksum_is_calculated_once(tmp_path, mocker):
+    path = tmp_path / "file.fits"
+    fits.PrimaryHDU().writeto(path)
+    md5 = mocker.spy(ssda.util.fits.hashlib, "md5")
+
+    fits_file = ssda.util.fits.StandardFitsFile(str(path))
+
+    assert fits_file.checksum() == fits_file.checksum()
+    md5.assert_called_once()
+
+
+def test_header_value(tmp_path):
+    path = tmp_path / "file.fits"
+    hdu = fits.PrimaryHDU()
+    hdu.header["OBJECT"] = " NGC 6822 "
+    hdu.header["PROPID"] = "None"
+    hdu.writeto(path)
+
+    fits_file = ssda.util.fits.StandardFitsFile(str(path))
+
+    assert fits_file.header_value("OBJECT") == "NGC 6822"
+    assert fits_file.header_value("object") == "NGC 6822"
+    assert fits_file.header_value("PROPID") is None
+    assert fits_file.header_value("BLOCKID") is None
+
+
+def test_instrument_is_determined_once(tmp_path, mocker):
+    path = tmp_path / "file.fits"
+    hdu = fits.PrimaryHDU()
+    hdu.header["INSTRUME"] = "RSS"
+    hdu.writeto(path)
+
+    fits_file = ssda.util.fits.StandardFitsFile(str(path))
+    header_value = mocker.spy(fits_file, "header_value")
+
+    assert fits_file.instrument() == Instrument.RSS
+    assert fits_file.instrument() == Instrument.RSS
+    header_value.assert_called_once_with("INSTRUME")
+
+
 class FitsFileDirParams(NamedTuple):
     night: date
     instrument: Instrument
@@ -147,3 +277,35 @@ def test_fits_file_dir_returns_correct_dir(params):
         )
         == params.path
     )
+
+
+@pytest.mark.parametrize(
+    "base_dir,path,relative_path",
+    [
+        ("/fits", "/fits/salt/data/a.fits", "salt/data/a.fits"),
+        ("/fits/", "/fits/salt/data/a.fits", "salt/data/a.fits"),
+        ("/", "/salt/data/a.fits", "salt/data/a.fits"),
+    ],
+)
+def test_fits_file_path_relative_to_base_dir(base_dir, path, relative_path):
+    ssda.util.fits.set_fits_base_dir(base_dir)
+
+    assert ssda.util.fits.fits_file_path_relative_to_base_dir(path) == relative_path
+
+
+def test_fits_file_path_relative_to_base_dir_requires_path_in_base_dir():
+    ssda.util.fits.set_fits_base_dir("/fits")
+
+    with pytest.raises(ValueError):
+        ssda.util.fits.fits_file_path_relative_to_base_dir("/fits2/salt/a.fits")
+
+
+def test_checksum_is_calculated_in_chunks(tmp_path, mocker):
+    path = tmp_path / "file.fits"
+    hdu = fits.PrimaryHDU(data=np.arange(10000, dtype=np.int32))
+    hdu.writeto(path)
+    mocker.patch.object(ssda.util.fits, "_CHECKSUM_CHUNK_SIZE", 1000)
+
+    fits_file = ssda.util.fits.StandardFitsFile(str(path))
+
+    assert fits_file.checksum() == hashlib.md5(path.read_bytes()).hexdigest()